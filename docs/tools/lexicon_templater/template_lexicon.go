@@ -1,6 +1,7 @@
 package main
 
 import (
+	"bufio"
 	"encoding/json"
 	htmltemplate "html/template"
 	"io/ioutil"
@@ -28,6 +29,9 @@ func (r *rules) Named(name string) *rule {
 func (r *rules) AddLinks(name, docstring string) string {
 	if strings.Contains(name, "_") { // Don't do it for something generic like "tarball"
 		for k := range r.Functions {
+			if !strings.Contains(docstring, k) {
+				continue // Can't possibly match, don't bother compiling a regex for it.
+			}
 			var re = regexp.MustCompile("\b("+k+")\b")
 			if name == k {
 				docstring = re.ReplaceAllString(docstring, "<code>$1</code>")
@@ -77,5 +81,8 @@ func main() {
 			rule.Aliases = append(rule.Aliases, "c"+name)
 		}
 	}
-	must(tmpl.Execute(os.Stdout, r))
+	// The template produces a lot of small writes; buffer them so we don't make a syscall for each one.
+	w := bufio.NewWriter(os.Stdout)
+	must(tmpl.Execute(w, r))
+	must(w.Flush())
 }
@@ -37,11 +37,27 @@ func Printf(msg string, args ...interface{}) {
 // Fprintf implements essentially fmt.Fprintf with replacements of
 // some ANSI sequences, e.g. ${BOLD_RED} -> \x1bwhatever.
 func Fprintf(w io.Writer, msg string, args ...interface{}) {
-	for k, v := range replacements {
-		if !ShowColouredOutput {
-			v = ""
+	// Nothing to replace if there are no sequences, so don't bother scanning for each of them.
+	if strings.Contains(msg, "${") {
+		if ShowColouredOutput {
+			msg = colourReplacer.Replace(msg)
+		} else {
+			msg = plainReplacer.Replace(msg)
 		}
-		msg = strings.ReplaceAll(msg, fmt.Sprintf("${%s}", k), v)
 	}
 	fmt.Fprintf(w, msg, args...)
 }
+
+// colourReplacer and plainReplacer respectively replace the sequences above with their ANSI codes
+// or strip them out entirely. They're built once up front so we make a single pass over each message.
+var colourReplacer, plainReplacer = newReplacers()
+
+func newReplacers() (*strings.Replacer, *strings.Replacer) {
+	colour := make([]string, 0, 2*len(replacements))
+	plain := make([]string, 0, 2*len(replacements))
+	for k, v := range replacements {
+		colour = append(colour, "${"+k+"}", v)
+		plain = append(plain, "${"+k+"}", "")
+	}
+	return strings.NewReplacer(colour...), strings.NewReplacer(plain...)
+}
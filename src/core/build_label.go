@@ -115,15 +115,35 @@ func validateSuffixes(pkgName, name string) error {
 
 // validatePackageName checks whether this string is a valid package name and returns true if so.
 func validatePackageName(name string) bool {
-	return name == "" || (name[0] != '/' && name[len(name)-1] != '/' && !strings.ContainsAny(name, `|$*?[]{}:()&\`) && !strings.Contains(name, "//"))
+	return name == "" || (name[0] != '/' && name[len(name)-1] != '/' && !containsInvalidNameChars(name, true) && !strings.Contains(name, "//"))
 }
 
 // validateTargetName checks whether this string is a valid target name and returns true if so.
 func validateTargetName(name string) bool {
-	return name != "" && !strings.ContainsAny(name, `|$*?[]{}:()&/\`) && (name[0] != '.' || name == "...") &&
+	return name != "" && !containsInvalidNameChars(name, false) && (name[0] != '.' || name == "...") &&
 		!strings.HasSuffix(name, buildDirSuffix) && !strings.HasSuffix(name, testDirSuffix)
 }
 
+// invalidNameChars marks the characters that can't appear in either package or target names.
+var invalidNameChars = func() (chars [256]bool) {
+	for _, c := range `|$*?[]{}:()&\` {
+		chars[c] = true
+	}
+	return chars
+}()
+
+// containsInvalidNameChars returns true if the given name contains any characters that aren't
+// allowed in a package name (or, if slashes aren't allowed, a target name).
+// This is called for every label we parse so it's worth being quicker than strings.ContainsAny.
+func containsInvalidNameChars(name string, allowSlash bool) bool {
+	for i := 0; i < len(name); i++ {
+		if c := name[i]; invalidNameChars[c] || (c == '/' && !allowSlash) {
+			return true
+		}
+	}
+	return false
+}
+
 // ParseBuildLabel parses a single build label from a string. Panics on failure.
 func ParseBuildLabel(target, currentPath string) BuildLabel {
 	label, err := TryParseBuildLabel(target, currentPath, "")
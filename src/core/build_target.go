@@ -1440,6 +1440,16 @@ func (target *BuildTarget) AddMaybeExportedDependency(dep BuildLabel, exported,
 	}
 }
 
+// GrowDependencies makes room for n more dependencies, for callers that know how many they're
+// about to add so it doesn't have to be grown one at a time.
+func (target *BuildTarget) GrowDependencies(n int) {
+	if l := len(target.dependencies); n > cap(target.dependencies)-l {
+		deps := make([]depInfo, l, l+n)
+		copy(deps, target.dependencies)
+		target.dependencies = deps
+	}
+}
+
 // IsTool returns true if the given build label is a tool used by this target.
 func (target *BuildTarget) IsTool(tool BuildLabel) bool {
 	for _, t := range target.Tools {
@@ -435,6 +435,18 @@ func TestAddDependency(t *testing.T) {
 	assert.Equal(t, []*BuildTarget{target1}, target2.Dependencies())
 }
 
+func TestGrowDependencies(t *testing.T) {
+	target1 := makeTarget1("//src/core:target1", "")
+	target2 := makeTarget1("//src/core:target2", "")
+	target3 := makeTarget1("//src/core:target3", "")
+	target3.AddDependency(target1.Label)
+	target3.GrowDependencies(2)
+	assert.Equal(t, 1, len(target3.dependencies))
+	assert.True(t, cap(target3.dependencies) >= 3)
+	target3.AddDependency(target2.Label)
+	assert.Equal(t, []BuildLabel{target1.Label, target2.Label}, target3.DeclaredDependencies())
+}
+
 func TestAddDependencySource(t *testing.T) {
 	target1 := makeTarget1("//src/core:target1", "")
 	target2 := makeTarget1("//src/core:target2", "")
@@ -534,6 +534,8 @@ type Configuration struct {
 		CppTool            string     `help:"The tool invoked to compile C++ code. Defaults to g++ but you might want to set it to clang++, for example." var:"CPP_TOOL"`
 		LdTool             string     `help:"The tool invoked to link object files. Defaults to ld but you could also set it to gold, for example." var:"LD_TOOL"`
 		ArTool             string     `help:"The tool invoked to archive static libraries. Defaults to ar." var:"AR_TOOL"`
+		CcacheTool         string     `help:"A compiler cache such as ccache to wrap C and C++ compilation with. Empty (the default) disables this.\nThe build environment's HOME is a temporary directory, so you'll want to set CCACHE_DIR to somewhere persistent and add it to PassUnsafeEnv." example:"ccache" var:"CC_CACHE_TOOL"`
+		Linker             string     `help:"The linker for the compiler to use when linking binaries (i.e. the argument to -fuse-ld), for example lld or gold, which are typically much faster than the default for large binaries.\nHas no effect if LinkWithLdTool is set." example:"lld" var:"CC_LINKER"`
 		LinkWithLdTool     bool       `help:"If true, instructs Please to use the tool set earlier in ldtool to link binaries instead of cctool.\nThis is an esoteric setting that most people don't want; a vanilla ld will not perform all steps necessary here (you'll get lots of missing symbol messages from having no libc etc). Generally best to leave this disabled unless you have very specific requirements." var:"LINK_WITH_LD_TOOL"`
 		DefaultOptCflags   string     `help:"Compiler flags passed to all C rules during opt builds; these are typically pretty basic things like what language standard you want to target, warning flags, etc.\nDefaults to --std=c99 -O3 -DNDEBUG -Wall -Wextra -Werror" var:"DEFAULT_OPT_CFLAGS"`
 		DefaultDbgCflags   string     `help:"Compiler rules passed to all C rules during dbg builds.\nDefaults to --std=c99 -g3 -DDEBUG -Wall -Wextra -Werror." var:"DEFAULT_DBG_CFLAGS"`
@@ -6,10 +6,17 @@ package format
 
 import (
 	"bytes"
+	"context"
+	"crypto/sha1"
+	"io"
 	"io/ioutil"
 	"os"
+	"path"
+	"sync"
+	"sync/atomic"
 
 	"github.com/bazelbuild/buildtools/build"
+	"golang.org/x/sync/errgroup"
 	"gopkg.in/op/go-logging.v1"
 
 	"github.com/thought-machine/please/src/core"
@@ -19,60 +26,245 @@ import (
 
 var log = logging.MustGetLogger("format")
 
+// formatCacheFile is where we record which file contents were already canonical, so later runs can skip them.
+var formatCacheFile = path.Join(core.OutDir, "log", "fmt_cache")
+
 // Format reformats the given BUILD files to their canonical version.
 // It either prints the reformatted versions to stdout or rewrites the files in-place.
 // If no files are given then all BUILD files under the repo root are discovered.
 // The returned bool is true if any changes were needed.
 func Format(config *core.Configuration, filenames []string, rewrite, quiet bool) (bool, error) {
+	cacheFile := path.Join(core.RepoRoot, formatCacheFile)
+	cache := loadFormatCache(cacheFile)
+	var ch <-chan string
 	if len(filenames) == 0 {
-		return formatAll(utils.FindAllBuildFiles(config, core.RepoRoot, ""), rewrite, quiet)
+		ch = utils.FindAllBuildFiles(config, core.RepoRoot, "")
+	} else {
+		c := make(chan string)
+		go func() {
+			for _, filename := range filenames {
+				c <- filename
+			}
+			close(c)
+		}()
+		ch = c
+	}
+	changed, err := formatAll(ch, rewrite, quiet, config.Please.NumThreads, cache, os.Stdout)
+	if err == nil {
+		if err := cache.Save(cacheFile); err != nil {
+			log.Warning("Failed to save format cache: %s", err)
+		}
+	}
+	return changed, err
+}
+
+// A formatCache holds the canonical form of file contents we've already formatted, keyed by their hash.
+type formatCache struct {
+	// Formatted versions of contents that weren't canonical.
+	contents map[[sha1.Size]byte][]byte
+	// Contents that are known to be canonical. The value is true if they've been seen in this run.
+	canonical map[[sha1.Size]byte]bool
+	mutex     sync.Mutex
+}
+
+func newFormatCache() *formatCache {
+	return &formatCache{
+		contents:  map[[sha1.Size]byte][]byte{},
+		canonical: map[[sha1.Size]byte]bool{},
+	}
+}
+
+// loadFormatCache loads a cache of canonical contents from the given file.
+// The cache is best-effort so if it can't be read we just start afresh.
+// It's tied to the Please version since a different formatter might have different ideas of canonical.
+func loadFormatCache(filename string) *formatCache {
+	cache := newFormatCache()
+	b, err := ioutil.ReadFile(filename)
+	if err != nil {
+		return cache
+	}
+	header := core.PleaseVersion + "\n"
+	if !bytes.HasPrefix(b, []byte(header)) || (len(b)-len(header))%sha1.Size != 0 {
+		log.Debug("Ignoring out of date or invalid format cache %s", filename)
+		return cache
+	}
+	for b = b[len(header):]; len(b) > 0; b = b[sha1.Size:] {
+		var key [sha1.Size]byte
+		copy(key[:], b)
+		cache.canonical[key] = false
+	}
+	return cache
+}
+
+// maxFormatCacheEntries is the most entries we'll write to the format cache file.
+// It's about 2MB; beyond that, entries that weren't seen in this run are dropped.
+const maxFormatCacheEntries = 100000
+
+// Save writes all the canonical contents we know about to the given file. That includes ones loaded
+// from it that weren't seen in this run, since that might only have formatted some of the repo.
+// If there are too many, the ones that were seen in this run are preferred.
+func (cache *formatCache) Save(filename string) error {
+	cache.mutex.Lock()
+	defer cache.mutex.Unlock()
+	n := len(cache.canonical)
+	if n > maxFormatCacheEntries {
+		n = maxFormatCacheEntries
 	}
-	ch := make(chan string)
-	go func() {
-		for _, filename := range filenames {
-			ch <- filename
+	var buf bytes.Buffer
+	buf.Grow(len(core.PleaseVersion) + 1 + n*sha1.Size)
+	buf.WriteString(core.PleaseVersion)
+	buf.WriteByte('\n')
+	for _, wantSeen := range []bool{true, false} {
+		for key, seen := range cache.canonical {
+			if seen == wantSeen && n > 0 {
+				buf.Write(key[:])
+				n--
+			}
 		}
-		close(ch)
-	}()
-	return formatAll(ch, rewrite, quiet)
+	}
+	return fs.WriteFile(&buf, filename, 0644)
+}
+
+// An indexedFile is a filename along with its position in the input.
+type indexedFile struct {
+	Index    int
+	Filename string
+}
+
+// formatAll formats all the given files, using the given number of workers in parallel.
+// If we aren't rewriting them (and aren't quiet) the reformatted files are written to the given
+// writer in the order they were received, regardless of which order the workers finish in.
+// It stops at the first error.
+func formatAll(filenames <-chan string, rewrite, quiet bool, workers int, cache *formatCache, w io.Writer) (bool, error) {
+	if workers < 1 {
+		workers = 1
+	}
+	g, ctx := errgroup.WithContext(context.Background())
+	files := make(chan indexedFile)
+	g.Go(func() error {
+		defer close(files)
+		i := 0
+		for filename := range filenames {
+			select {
+			case files <- indexedFile{Index: i, Filename: filename}:
+				i++
+			case <-ctx.Done():
+				// Keep draining so whatever is sending the filenames doesn't block forever.
+				go func() {
+					for range filenames {
+					}
+				}()
+				return nil
+			}
+		}
+		return nil
+	})
+	var changed int32
+	out := orderedWriter{w: w, pending: map[int][]byte{}}
+	for i := 0; i < workers; i++ {
+		g.Go(func() error {
+			for file := range files {
+				if ctx.Err() != nil {
+					return nil // Something else has failed, don't carry on.
+				}
+				c, after, err := format(file.Filename, rewrite, cache)
+				if err != nil {
+					return err
+				} else if c {
+					atomic.StoreInt32(&changed, 1)
+				}
+				if !c || rewrite || quiet {
+					after = nil
+				}
+				out.Write(file.Index, after)
+			}
+			return nil
+		})
+	}
+	err := g.Wait()
+	return atomic.LoadInt32(&changed) == 1, err
+}
+
+// An orderedWriter writes outputs in order of their index, holding on to any that arrive early
+// until everything before them has been written.
+type orderedWriter struct {
+	w       io.Writer
+	pending map[int][]byte
+	next    int
+	mutex   sync.Mutex
 }
 
-func formatAll(filenames <-chan string, rewrite, quiet bool) (bool, error) {
-	changed := false
-	for filename := range filenames {
-		c, err := format(filename, rewrite, quiet)
-		if err != nil {
-			return changed, err
+// Write writes the output with the given index, which may be nil if there is nothing to write for it.
+// Every index must be written for anything after it to be.
+func (ow *orderedWriter) Write(index int, output []byte) {
+	ow.mutex.Lock()
+	defer ow.mutex.Unlock()
+	ow.pending[index] = output
+	for {
+		output, present := ow.pending[ow.next]
+		if !present {
+			return
 		}
-		changed = changed || c
+		ow.w.Write(output)
+		delete(ow.pending, ow.next)
+		ow.next++
 	}
-	return changed, nil
 }
 
-func format(filename string, rewrite, quiet bool) (bool, error) {
+// format formats a single file. It returns true if it wasn't already canonical, along with
+// the canonical contents.
+func format(filename string, rewrite bool, cache *formatCache) (bool, []byte, error) {
 	before, err := ioutil.ReadFile(filename)
 	if err != nil {
-		return true, err
+		return true, nil, err
 	}
-	f, err := build.ParseBuild(filename, before)
+	after, err := canonicalise(filename, before, cache)
 	if err != nil {
-		return true, err
+		return true, nil, err
 	}
-	after := build.Format(f)
 	if bytes.Equal(before, after) {
 		log.Debug("%s is already in canonical format", filename)
-		return false, nil
+		return false, after, nil
 	} else if !rewrite {
 		log.Debug("%s is not in canonical format", filename)
-		if !quiet {
-			os.Stdout.Write(after)
-		}
-		return true, nil
+		return true, after, nil
 	}
 	log.Info("Rewriting %s into canonical format", filename)
 	info, err := os.Stat(filename)
 	if err != nil {
-		return true, err
+		return true, after, err
+	}
+	return true, after, fs.WriteFile(bytes.NewReader(after), filename, info.Mode())
+}
+
+// canonicalise returns the canonical version of the given file contents.
+// Generated and vendored BUILD files are often identical, so we only parse each distinct one once.
+func canonicalise(filename string, contents []byte, cache *formatCache) ([]byte, error) {
+	key := sha1.Sum(contents)
+	cache.mutex.Lock()
+	if _, present := cache.canonical[key]; present {
+		cache.canonical[key] = true
+		cache.mutex.Unlock()
+		return contents, nil
+	}
+	after, present := cache.contents[key]
+	cache.mutex.Unlock()
+	if present {
+		return after, nil
+	}
+	f, err := build.ParseBuild(filename, contents)
+	if err != nil {
+		return nil, err
+	}
+	after = build.Format(f)
+	cache.mutex.Lock()
+	defer cache.mutex.Unlock()
+	if bytes.Equal(contents, after) {
+		cache.canonical[key] = true
+	} else {
+		cache.contents[key] = after
+		// The reformatted version is itself canonical, which is useful next time if we're rewriting it.
+		cache.canonical[sha1.Sum(after)] = true
 	}
-	return true, fs.WriteFile(bytes.NewReader(after), filename, info.Mode())
+	return after, nil
 }
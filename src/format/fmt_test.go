@@ -1,7 +1,11 @@
 package format
 
 import (
+	"bytes"
+	"crypto/sha1"
+	"fmt"
 	"io/ioutil"
+	"path/filepath"
 	"testing"
 
 	"github.com/stretchr/testify/assert"
@@ -29,3 +33,88 @@ func TestFormat(t *testing.T) {
 	require.NoError(t, err)
 	assert.Equal(t, beforeContents, afterContents)
 }
+
+func TestFormatAllPreservesOrder(t *testing.T) {
+	dir := t.TempDir()
+	ch := make(chan string)
+	var expected bytes.Buffer
+	var filenames []string
+	for i := 0; i < 20; i++ {
+		filename := filepath.Join(dir, fmt.Sprintf("BUILD%d", i))
+		contents := []byte(fmt.Sprintf("go_library(name='lib%d')\n", i))
+		require.NoError(t, ioutil.WriteFile(filename, contents, 0644))
+		after, err := canonicalise(filename, contents, newFormatCache())
+		require.NoError(t, err)
+		expected.Write(after)
+		filenames = append(filenames, filename)
+	}
+	go func() {
+		for _, filename := range filenames {
+			ch <- filename
+		}
+		close(ch)
+	}()
+	var buf bytes.Buffer
+	changed, err := formatAll(ch, false, false, 8, newFormatCache(), &buf)
+	assert.NoError(t, err)
+	assert.True(t, changed)
+	assert.Equal(t, expected.String(), buf.String())
+}
+
+func TestFormatAllStopsAtFirstError(t *testing.T) {
+	dir := t.TempDir()
+	bad := filepath.Join(dir, "BUILD.bad")
+	good := filepath.Join(dir, "BUILD.good")
+	contents := []byte("go_library(name='lib')\n")
+	require.NoError(t, ioutil.WriteFile(bad, []byte("go_library(\n"), 0644))
+	require.NoError(t, ioutil.WriteFile(good, contents, 0644))
+	ch := make(chan string)
+	go func() {
+		ch <- bad
+		ch <- good
+		close(ch)
+	}()
+	_, err := formatAll(ch, true, false, 1, newFormatCache(), ioutil.Discard)
+	assert.Error(t, err)
+	// Nothing after the failure should have been rewritten.
+	after, err := ioutil.ReadFile(good)
+	require.NoError(t, err)
+	assert.Equal(t, contents, after)
+}
+
+func TestCanonicaliseCachesByContent(t *testing.T) {
+	cache := newFormatCache()
+	before := []byte("go_library(name='x')\n")
+	after, err := canonicalise("BUILD", before, cache)
+	require.NoError(t, err)
+	assert.NotEqual(t, before, after)
+	assert.Equal(t, 1, len(cache.contents))
+	// The same contents from a different file shouldn't need parsing again.
+	after2, err := canonicalise("other/BUILD", before, cache)
+	require.NoError(t, err)
+	assert.Equal(t, after, after2)
+	assert.Equal(t, 1, len(cache.contents))
+	// The reformatted version is known to be canonical already.
+	assert.True(t, cache.canonical[sha1.Sum(after)])
+	after3, err := canonicalise("BUILD", after, cache)
+	require.NoError(t, err)
+	assert.Equal(t, after, after3)
+}
+
+func TestFormatCacheRoundTrip(t *testing.T) {
+	filename := filepath.Join(t.TempDir(), "fmt_cache")
+	cache := newFormatCache()
+	seen := sha1.Sum([]byte("seen"))
+	unseen := sha1.Sum([]byte("unseen"))
+	cache.canonical[seen] = true
+	cache.canonical[unseen] = false
+	require.NoError(t, cache.Save(filename))
+
+	loaded := loadFormatCache(filename)
+	// Entries that weren't seen in this run are kept, since it might only have covered part of the repo.
+	assert.Equal(t, map[[sha1.Size]byte]bool{seen: false, unseen: false}, loaded.canonical)
+
+	// A cache from a different version of Please shouldn't be trusted.
+	require.NoError(t, ioutil.WriteFile(filename, append([]byte("0.0.1\n"), seen[:]...), 0644))
+	assert.Equal(t, 0, len(loadFormatCache(filename).canonical))
+}
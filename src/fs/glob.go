@@ -92,6 +92,7 @@ func (globber *Globber) Glob(rootPath string, includes, excludes []string, inclu
 		rootPath = "."
 	}
 
+	prefix := rootPath + "/"
 	var filenames []string
 	for _, include := range includes {
 		mustBeValidGlobString(include)
@@ -100,9 +101,15 @@ func (globber *Globber) Glob(rootPath string, includes, excludes []string, inclu
 		if err != nil {
 			panic(fmt.Errorf("error globbing files with %v: %v", include, err))
 		}
-		// Remove the root path from the returned files and add them to the output
-		for _, filename := range matches {
-			filenames = append(filenames, strings.TrimPrefix(filename, rootPath+"/"))
+		// Remove the root path from the returned files and add them to the output.
+		// matches is always freshly allocated so it's safe to reuse it for the first include.
+		for i, filename := range matches {
+			matches[i] = strings.TrimPrefix(filename, prefix)
+		}
+		if filenames == nil {
+			filenames = matches
+		} else {
+			filenames = append(filenames, matches...)
 		}
 	}
 	return filenames
@@ -127,6 +134,7 @@ func (globber *Globber) glob(rootPath string, glob string, excludes []string, in
 	}
 
 	matches := make([]string, 0, len(globMatches))
+	var excl []excludeMatcher
 	for _, m := range globMatches {
 		if isInDirectories(m, walkedDir.subPackages) {
 			continue
@@ -135,11 +143,15 @@ func (globber *Globber) glob(rootPath string, glob string, excludes []string, in
 			continue
 		}
 
-		shouldExclude, err := shouldExcludeMatch(rootPath, m, excludes)
-		if err != nil {
-			return nil, err
+		if excl == nil && len(excludes) > 0 {
+			// Compile these once up front rather than for every candidate file.
+			if excl, err = compileExcludes(rootPath, excludes); err != nil {
+				return nil, err
+			}
 		}
-		if shouldExclude {
+		if shouldExclude, err := shouldExcludeCompiled(m, excl); err != nil {
+			return nil, err
+		} else if shouldExclude {
 			continue
 		}
 
@@ -189,38 +201,70 @@ func isBathPathOf(path string, base string) bool {
 	return rest == "" || rest[0] == filepath.Separator
 }
 
+// An excludeMatcher is a precompiled exclude pattern.
+type excludeMatcher struct {
+	// The pattern joined to the root, used to exclude entire directories.
+	path string
+	// Matches against the whole path.
+	full matcher
+	// Matches against the base of the path; only set if the pattern doesn't contain any slashes.
+	base matcher
+}
+
+// compileExcludes compiles a set of exclude patterns relative to the given root.
+func compileExcludes(root string, excludes []string) ([]excludeMatcher, error) {
+	ret := make([]excludeMatcher, len(excludes))
+	for i, excl := range excludes {
+		mustBeValidGlobString(excl)
+
+		full, err := patternToMatcher(root, excl)
+		if err != nil {
+			return nil, err
+		}
+		ret[i] = excludeMatcher{path: filepath.Join(root, excl), full: full}
+		if !strings.ContainsRune(excl, '/') {
+			if ret[i].base, err = patternToMatcher("", excl); err != nil {
+				return nil, err
+			}
+		}
+	}
+	return ret, nil
+}
+
 // shouldExcludeMatch checks if the match also matches any of the exclude patterns. If the exclude pattern is a relative
 // pattern i.e. doesn't contain any /'s, then the pattern is checked against the file name part only. Otherwise the
 // pattern is checked against the whole path. This is so `glob(["**/*.go"], exclude = ["*_test.go"])` will match as
 // you'd expect.
 func shouldExcludeMatch(root, match string, excludes []string) (bool, error) {
-	for _, excl := range excludes {
-		mustBeValidGlobString(excl)
-
-		rootPath := root
-		m := match
+	excl, err := compileExcludes(root, excludes)
+	if err != nil {
+		return false, err
+	}
+	return shouldExcludeCompiled(match, excl)
+}
 
-		if isBathPathOf(match, filepath.Join(root, excl)) {
+// shouldExcludeCompiled is like shouldExcludeMatch but takes a set of precompiled exclude patterns.
+func shouldExcludeCompiled(match string, excludes []excludeMatcher) (bool, error) {
+	hasSlash := strings.ContainsRune(match, '/')
+	for _, excl := range excludes {
+		if isBathPathOf(match, excl.path) {
 			return true, nil
 		}
 
 		// If the exclude pattern doesn't contain any slashes and the match does, we only match against the base of the
 		// match path.
-		if strings.ContainsRune(match, '/') && !strings.ContainsRune(excl, '/') {
+		matcher := excl.full
+		m := match
+		if hasSlash && excl.base != nil {
+			matcher = excl.base
 			m = path.Base(match)
-			rootPath = ""
-		}
-
-		matcher, err := patternToMatcher(rootPath, excl)
-		if err != nil {
-			return false, err
 		}
 
-		match, err := matcher.Match(m)
+		matched, err := matcher.Match(m)
 		if err != nil {
 			return false, err
 		}
-		if match {
+		if matched {
 			return true, nil
 		}
 	}
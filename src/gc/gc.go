@@ -6,6 +6,7 @@
 package gc
 
 import (
+	"bufio"
 	"bytes"
 	"fmt"
 	"io/ioutil"
@@ -28,17 +29,21 @@ type targetMap map[*core.BuildTarget]bool
 // GarbageCollect initiates the garbage collection logic.
 func GarbageCollect(state *core.BuildState, filter, targets, keepTargets []core.BuildLabel, keepLabels []string, conservative, targetsOnly, srcsOnly, noPrompt, dryRun, git bool) {
 	if targets, srcs := targetsToRemove(state.Graph, filter, targets, keepTargets, keepLabels, conservative); len(targets) > 0 {
+		// The lists can be long so buffer them, flushing each before anything more is written to stderr.
+		w := bufio.NewWriter(os.Stdout)
 		if !srcsOnly {
 			fmt.Fprintf(os.Stderr, "Targets to remove (total %d of %d):\n", len(targets), len(state.Graph.AllTargets()))
 			for _, target := range targets {
-				fmt.Printf("  %s\n", target)
+				fmt.Fprintf(w, "  %s\n", target)
 			}
+			w.Flush()
 		}
 		if !targetsOnly && len(srcs) > 0 {
 			fmt.Fprintf(os.Stderr, "Corresponding source files to remove:\n")
 			for _, src := range srcs {
-				fmt.Printf("  %s\n", src)
+				fmt.Fprintf(w, "  %s\n", src)
 			}
+			w.Flush()
 		}
 		if dryRun {
 			return
@@ -210,36 +215,43 @@ func publicDependencies(graph *core.BuildGraph, target *core.BuildTarget) []*cor
 
 // RewriteFile rewrites a BUILD file to exclude a set of targets.
 func RewriteFile(state *core.BuildState, filename string, targets []string) error {
-	p := asp.NewParser(state)
-	stmts, err := p.ParseFileOnly(filename)
+	b, err := ioutil.ReadFile(filename)
 	if err != nil {
 		return err
 	}
-	b, err := ioutil.ReadFile(filename)
+	// Parse the contents we've already got rather than reading the file a second time.
+	stmts, err := asp.NewParser(state).ParseData(b, filename)
 	if err != nil {
-		return err // This is very unlikely since we already read it once above, but y'know...
+		return err
 	}
 	lines := bytes.Split(b, []byte{'\n'})
-	linesToDelete := map[int]bool{}
+	deleted := make([]bool, len(lines))
+	found := asp.FindTargets(stmts, targets)
 	for _, target := range targets {
-		stmt := asp.FindTarget(stmts, target)
+		stmt := found[target]
 		if stmt == nil {
 			log.Warning("Can't find target %s in %s", target, filename)
 			continue
 		}
 		start, end := asp.GetExtents(stmts, stmt, len(lines))
 		for i := start; i <= end; i++ {
-			linesToDelete[i-1] = true // -1 because the extents are 1-indexed
+			deleted[i-1] = true // -1 because the extents are 1-indexed
 		}
 	}
-	// Now rewrite the actual file
-	lines2 := make([][]byte, 0, len(lines))
+	// Now rewrite the actual file, copying the surviving lines straight into the output.
+	var buf bytes.Buffer
+	buf.Grow(len(b))
+	written := false
 	for i, line := range lines {
-		if !linesToDelete[i] {
-			lines2 = append(lines2, line)
+		if !deleted[i] {
+			if written {
+				buf.WriteByte('\n')
+			}
+			buf.Write(line)
+			written = true
 		}
 	}
-	return ioutil.WriteFile(filename, bytes.Join(lines2, []byte{'\n'}), 0664)
+	return ioutil.WriteFile(filename, buf.Bytes(), 0664)
 }
 
 // removeTargets rewrites the given set of targets out of their BUILD files.
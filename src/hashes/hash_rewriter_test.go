@@ -10,6 +10,7 @@ import (
 
 	"github.com/thought-machine/please/src/core"
 	"github.com/thought-machine/please/src/fs"
+	"github.com/thought-machine/please/src/parse/asp"
 )
 
 func TestRewriteHashes(t *testing.T) {
@@ -30,3 +31,22 @@ func TestRewriteHashes(t *testing.T) {
 	assert.NoError(t, err)
 	assert.EqualValues(t, string(after), string(rewritten))
 }
+
+func TestRewriteHashDuplicatedOnLine(t *testing.T) {
+	// The same hash appears twice on one line; only the one we chose should be rewritten.
+	data := []byte(`remote_file(
+    name = "test1",
+    hashes = ["f572d396fae9206628714fb2ce00f72e94f2258f", "f572d396fae9206628714fb2ce00f72e94f2258f"],
+)
+`)
+	stmts, err := asp.NewParser(core.NewDefaultBuildState()).ParseData(data, "test.build")
+	assert.NoError(t, err)
+	hashes := map[string]string{"test1": "b9643f8154a9e9912d730a931d329afc82a44a52"}
+	e, err := rewriteHash(lineOffsets(data), findHashArguments(stmts, hashes), "", "test1", hashes["test1"])
+	assert.NoError(t, err)
+	assert.Equal(t, `remote_file(
+    name = "test1",
+    hashes = ["b9643f8154a9e9912d730a931d329afc82a44a52", "f572d396fae9206628714fb2ce00f72e94f2258f"],
+)
+`, string(applyEdits(data, []edit{e})))
+}
@@ -6,6 +6,7 @@ import (
 	"fmt"
 	"io/ioutil"
 	"runtime"
+	"sort"
 	"strings"
 
 	"gopkg.in/op/go-logging.v1"
@@ -51,60 +52,130 @@ func RewriteHashes(state *core.BuildState, labels []core.BuildLabel) {
 // rewriteHashes rewrites hashes in a single file.
 func rewriteHashes(state *core.BuildState, filename, platform string, hashes map[string]string) error {
 	log.Notice("Rewriting hashes in %s...", filename)
-	p := asp.NewParser(state)
-	stmts, err := p.ParseFileOnly(filename)
+	b, err := ioutil.ReadFile(filename)
 	if err != nil {
 		return err
 	}
-	b, err := ioutil.ReadFile(filename)
+	stmts, err := asp.NewParser(state).ParseData(b, filename)
 	if err != nil {
 		return err
 	}
-	lines := bytes.Split(b, []byte{'\n'})
+	lines := lineOffsets(b)
+	args := findHashArguments(stmts, hashes)
+	edits := make([]edit, 0, len(hashes))
 	for k, v := range hashes {
-		if err := rewriteHash(lines, stmts, platform, k, v); err != nil {
+		e, err := rewriteHash(lines, args, platform, k, v)
+		if err != nil {
 			return err
 		}
+		edits = append(edits, e)
 	}
-	return ioutil.WriteFile(filename, bytes.Join(lines, []byte{'\n'}), 0664)
+	return ioutil.WriteFile(filename, applyEdits(b, edits), 0664)
+}
+
+// An edit is a replacement of part of a file's contents.
+type edit struct {
+	offset, length int
+	replacement    string
+}
+
+// lineOffsets returns the offset of the start of each line in the given data.
+func lineOffsets(b []byte) []int {
+	offsets := make([]int, 1, bytes.Count(b, []byte{'\n'})+1)
+	for i := bytes.IndexByte(b, '\n'); i != -1; {
+		offsets = append(offsets, i+1)
+		if j := bytes.IndexByte(b[i+1:], '\n'); j != -1 {
+			i += j + 1
+		} else {
+			break
+		}
+	}
+	return offsets
+}
+
+// applyEdits applies a set of non-overlapping edits to the given data in a single pass.
+func applyEdits(b []byte, edits []edit) []byte {
+	sort.Slice(edits, func(i, j int) bool { return edits[i].offset < edits[j].offset })
+	size := len(b)
+	for _, e := range edits {
+		size += len(e.replacement) - e.length
+	}
+	ret := make([]byte, 0, size)
+	last := 0
+	for _, e := range edits {
+		ret = append(ret, b[last:e.offset]...)
+		ret = append(ret, e.replacement...)
+		last = e.offset + e.length
+	}
+	return append(ret, b[last:]...)
 }
 
 // rewriteHash rewrites a single hash on a statement.
-func rewriteHash(lines [][]byte, stmts []*asp.Statement, platform, name, hash string) error {
-	stmt := asp.FindTarget(stmts, name)
-	if stmt == nil {
-		return fmt.Errorf("Can't find target %s to rewrite", name)
-	} else if arg := asp.FindArgument(stmt, "hash", "hashes"); arg != nil {
-		if arg.Value.Val != nil && arg.Value.Val.List != nil {
-			for _, h := range arg.Value.Val.List.Values {
-				if line, ok := rewriteLine(lines[h.Pos.Line-1], h.Pos.Column, platform, h.Val.String, hash); ok {
-					lines[h.Pos.Line-1] = line
-					return nil
-				}
-			}
-		} else if arg.Value.Val != nil && arg.Value.Val.String != "" {
-			h := arg.Value
-			if line, ok := rewriteLine(lines[h.Pos.Line-1], h.Pos.Column, platform, h.Val.String, hash); ok {
-				lines[h.Pos.Line-1] = line
-				return nil
-			}
+// It prefers the hash for the given platform, and otherwise falls back to the first one.
+func rewriteHash(lines []int, args map[string]*asp.CallArgument, platform, name, hash string) (edit, error) {
+	arg, found := args[name]
+	if !found {
+		return edit{}, fmt.Errorf("Can't find target %s to rewrite", name)
+	}
+	var candidates []*asp.Expression
+	if arg != nil && arg.Value.Val != nil {
+		if arg.Value.Val.List != nil {
+			candidates = arg.Value.Val.List.Values
+		} else if arg.Value.Val.String != "" {
+			candidates = []*asp.Expression{arg.Value}
+		}
+	}
+	var fallback *asp.Expression
+	for _, h := range candidates {
+		if h.Val == nil {
+			continue
+		}
+		if current := strings.Trim(h.Val.String, `"`); platform != "" && strings.HasPrefix(current, platform) {
+			return hashEdit(lines, h, current, platform+": "+hash), nil
+		} else if fallback == nil {
+			fallback = h
 		}
 	}
-	if platform != "" {
-		return rewriteHash(lines, stmts, "", name, hash)
+	if fallback != nil {
+		return hashEdit(lines, fallback, strings.Trim(fallback.Val.String, `"`), hash), nil
 	}
-	return fmt.Errorf("Can't find hash or hashes argument on %s", name)
+	return edit{}, fmt.Errorf("Can't find hash or hashes argument on %s", name)
 }
 
-// rewriteLine implements the rewriting logic within a single line.
-// It returns the new line and true if it should be replaced, or false if not.
-func rewriteLine(line []byte, start int, platform, current, new string) ([]byte, bool) {
-	current = strings.Trim(current, `"`) // asp string literals are surrounded by quotes
-	if strings.HasPrefix(current, platform) {
-		if platform != "" {
-			new = platform + ": " + new
+// findHashArguments finds the hash or hashes arguments of all the given targets in a single pass
+// over the file, picking up each statement's name and hashes together.
+// Targets that exist but have no hash argument map to nil; ones that don't exist at all are absent.
+func findHashArguments(stmts []*asp.Statement, hashes map[string]string) map[string]*asp.CallArgument {
+	ret := make(map[string]*asp.CallArgument, len(hashes))
+	for _, stmt := range stmts {
+		var nameArg, hashArg *asp.CallArgument
+		asp.WalkAST([]*asp.Statement{stmt}, func(arg *asp.CallArgument) bool {
+			switch arg.Name {
+			case "name":
+				nameArg = arg
+			case "hash", "hashes":
+				hashArg = arg
+			}
+			return false
+		})
+		if nameArg != nil && nameArg.Value.Val != nil {
+			name := strings.Trim(nameArg.Value.Val.String, `"`)
+			if _, wanted := hashes[name]; wanted {
+				ret[name] = hashArg
+				if len(ret) == len(hashes) {
+					break // Found everything we're looking for.
+				}
+			}
 		}
-		return bytes.Join([][]byte{line[:start], []byte(new), line[start+len(current):]}, nil), true
 	}
-	return nil, false
+	return ret
+}
+
+// hashEdit returns the edit replacing the current value of a hash with a new one.
+func hashEdit(lines []int, h *asp.Expression, current, new string) edit {
+	return edit{
+		offset:      lines[h.Pos.Line-1] + h.Pos.Column,
+		length:      len(current),
+		replacement: new,
+	}
 }
@@ -12,6 +12,15 @@ import (
 
 var urlRegex = regexp.MustCompile("https?://[^ ]+[^.]")
 
+// namedTypeExamples are example values for config types that are identified by their name
+// rather than their underlying kind (e.g. a Duration is an int64 but we don't want to show it as one).
+var namedTypeExamples = map[string]string{
+	"Duration":   "10ms | 20s | 5m",
+	"ByteSize":   "5K | 10MB | 20GiB",
+	"BuildLabel": "//src/core:core",
+	"Arch":       runtime.GOOS + "_" + runtime.GOARCH,
+}
+
 // ExampleValue returns an example value for a config field based on its type.
 func ExampleValue(f reflect.Value, name string, t reflect.Type, example, options string) string {
 	if t.Kind() == reflect.Slice {
@@ -22,7 +31,11 @@ func ExampleValue(f reflect.Value, name string, t reflect.Type, example, options
 		return strings.ReplaceAll(options, ",", " | ")
 	} else if name == "version" {
 		return core.PleaseVersion // keep it up to date!
-	} else if t.Kind() == reflect.String {
+	} else if value, present := namedTypeExamples[t.Name()]; present {
+		return value
+	}
+	switch t.Kind() {
+	case reflect.String:
 		if f.String() != "" {
 			return f.String()
 		}
@@ -30,23 +43,15 @@ func ExampleValue(f reflect.Value, name string, t reflect.Type, example, options
 			return "https://mydomain.com/somepath"
 		}
 		return "<str>"
-	} else if t.Kind() == reflect.Bool {
+	case reflect.Bool:
 		return "true | false | yes | no | on | off"
-	} else if t.Name() == "Duration" {
-		return "10ms | 20s | 5m"
-	} else if t.Kind() == reflect.Int || t.Kind() == reflect.Int64 {
+	case reflect.Int, reflect.Int64:
 		if f.Int() != 0 {
 			return fmt.Sprintf("%d", f.Int())
 		}
 		return "42"
-	} else if t.Name() == "ByteSize" {
-		return "5K | 10MB | 20GiB"
-	} else if t.Kind() == reflect.Uint64 {
+	case reflect.Uint64:
 		return fmt.Sprintf("%d", f.Uint())
-	} else if t.Name() == "BuildLabel" {
-		return "//src/core:core"
-	} else if t.Name() == "Arch" {
-		return runtime.GOOS + "_" + runtime.GOARCH
 	}
 	log.Fatalf("Unknown type: %s", t.Kind())
 	return ""
@@ -2,6 +2,7 @@
 package help
 
 import (
+	"bufio"
 	"fmt"
 	"os"
 	"regexp"
@@ -22,6 +23,9 @@ The following help topics are available:
 // maxSuggestionDistance is the maximum Levenshtein edit distance we'll suggest help topics at.
 const maxSuggestionDistance = 4
 
+// backtickRegex matches `quoted` sections of help messages which we highlight.
+var backtickRegex = regexp.MustCompile("\\`[^\\`\n]+\\`")
+
 // Help prints help on a particular topic.
 // It returns true if the topic is known or false if it isn't.
 func Help(topic string) bool {
@@ -41,8 +45,11 @@ func Help(topic string) bool {
 
 // Topics prints the list of help topics beginning with the given prefix.
 func Topics(prefix string) {
+	w := bufio.NewWriter(os.Stdout)
+	defer w.Flush()
 	for _, topic := range allTopics(prefix) {
-		fmt.Println(topic)
+		w.WriteString(topic)
+		w.WriteByte('\n')
 	}
 }
 
@@ -61,7 +68,7 @@ func help(topic string) string {
 		}
 	}
 	// Check built-in build rules.
-	m := AllBuiltinFunctions(newState())
+	m := helpBuiltinFunctions()
 	if f, present := m[topic]; present {
 		return helpFromBuildRule(f.FuncDef)
 	}
@@ -71,17 +78,21 @@ func help(topic string) string {
 // helpFromBuildRule returns the printable help message from a build rule (a function).
 func helpFromBuildRule(f *asp.FuncDef) string {
 	var b strings.Builder
-	if err := template.Must(template.New("").Funcs(template.FuncMap{
-		"trim": func(s string) string { return strings.Trim(s, `"`) },
-	}).Parse(docstringTemplate)).Execute(&b, f); err != nil {
+	if err := docstringTmpl.Execute(&b, f); err != nil {
 		log.Fatalf("%s", err)
 	}
 	s := strings.Replace(b.String(), "    Args:\n", "    ${BOLD_YELLOW}Args:${RESET}\n", 1)
-	for _, a := range f.Arguments {
-		r := regexp.MustCompile("( +)(" + a.Name + `)( \([a-z |]+\))?:`)
-		s = r.ReplaceAllString(s, "$1$${YELLOW}$2$${RESET}$${GREEN}$3$${RESET}:")
+	if len(f.Arguments) == 0 {
+		return s
+	}
+	// Match all the arguments in one pass; longer names go first so they win over any prefixes of them.
+	names := make([]string, len(f.Arguments))
+	for i, a := range f.Arguments {
+		names[i] = regexp.QuoteMeta(a.Name)
 	}
-	return s
+	sort.Slice(names, func(i, j int) bool { return len(names[i]) > len(names[j]) })
+	r := regexp.MustCompile("( +)(" + strings.Join(names, "|") + `)( \([a-z |]+\))?:`)
+	return r.ReplaceAllString(s, "$1$${YELLOW}$2$${RESET}$${GREEN}$3$${RESET}:")
 }
 
 // suggest looks through all known help topics and tries to make a suggestion about what the user might have meant.
@@ -99,7 +110,7 @@ func allTopics(prefix string) []string {
 			}
 		}
 	}
-	for t := range AllBuiltinFunctions(newState()) {
+	for t := range helpBuiltinFunctions() {
 		if strings.HasPrefix(t, prefix) {
 			topics = append(topics, t)
 		}
@@ -115,8 +126,7 @@ type helpSection struct {
 
 // printMessage prints a message, with some string replacements for ANSI codes.
 func printMessage(msg string) {
-	if cli.ShowColouredOutput {
-		backtickRegex := regexp.MustCompile("\\`[^\\`\n]+\\`")
+	if cli.ShowColouredOutput && strings.IndexByte(msg, '`') != -1 {
 		msg = backtickRegex.ReplaceAllStringFunc(msg, func(s string) string {
 			return "${BOLD_CYAN}" + strings.ReplaceAll(s, "`", "") + "${RESET}"
 		})
@@ -139,3 +149,8 @@ ${BOLD_YELLOW}{{ .Name }}${RESET}(
 Online help is available at https://please.build/lexicon.html#{{ .Name }}.
 {{- end }}
 `
+
+// docstringTmpl is the parsed form of docstringTemplate.
+var docstringTmpl = template.Must(template.New("").Funcs(template.FuncMap{
+	"trim": func(s string) string { return strings.Trim(s, `"`) },
+}).Parse(docstringTemplate))
@@ -44,3 +44,9 @@ func TestGeneralMessage(t *testing.T) {
 func TestTopics(t *testing.T) {
 	assert.NotEqual(t, "", help("topics"))
 }
+
+func TestHelpArgumentHighlighting(t *testing.T) {
+	s := help("go_binary")
+	assert.Contains(t, s, "${YELLOW}srcs${RESET}${GREEN} (list)${RESET}:")
+	assert.Contains(t, s, "${YELLOW}visibility${RESET}")
+}
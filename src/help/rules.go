@@ -8,6 +8,7 @@ import (
 	"regexp"
 	"sort"
 	"strings"
+	"sync"
 
 	"gopkg.in/op/go-logging.v1"
 
@@ -18,14 +19,31 @@ import (
 
 var log = logging.MustGetLogger("help")
 
+// argsRegex matches the header of the Args section of a docstring.
+var argsRegex = regexp.MustCompile("\n +Args: *\n")
+
+// argRegex matches the start of a single argument's description within the Args section.
+var argRegex = regexp.MustCompile(`(?m)^ *([A-Za-z_][A-Za-z0-9_]*)(?: \([^)\n]+\))?: *`)
+
+// builtinAssetsOnce guards parsing of the builtin rule assets. They're embedded in the binary
+// so can't change during a run, and we'd otherwise reparse them every time we look up a topic.
+var builtinAssetsOnce sync.Once
+var builtinAssetStmts []*asp.Statement
+
+// helpFunctionsOnce guards the set of functions we offer help on, which needs the config to be
+// read and any extra build_defs to be parsed; help looks them up more than once per invocation.
+var helpFunctionsOnce sync.Once
+var helpFunctions map[string]*asp.Statement
+
 // PrintRuleArgs prints the arguments of all builtin rules
 func PrintRuleArgs() {
 	env := getRuleArgs(newState())
-	b, err := json.MarshalIndent(env, "", "  ")
-	if err != nil {
+	// The encoder marshals into pooled buffers and writes out once, rather than copying the whole result out as MarshalIndent does.
+	enc := json.NewEncoder(os.Stdout)
+	enc.SetIndent("", "  ")
+	if err := enc.Encode(env); err != nil {
 		log.Fatalf("Failed JSON encoding: %s", err)
 	}
-	os.Stdout.Write(b)
 }
 
 func newState() *core.BuildState {
@@ -44,22 +62,10 @@ func newState() *core.BuildState {
 func AllBuiltinFunctions(state *core.BuildState) map[string]*asp.Statement {
 	p := asp.NewParser(state)
 	m := map[string]*asp.Statement{}
-	dir, _ := rules.AllAssets()
-	sort.Strings(dir)
-	for _, filename := range dir {
-		if filename != "builtins.build_defs" {
-			assetSrc, err := rules.ReadAsset(filename)
-			if err != nil {
-				log.Fatalf("Failed to read an asset %s", filename)
-			}
-			if stmts, err := p.ParseData(assetSrc, filename); err == nil {
-				addAllFunctions(m, stmts, true)
-			}
-		}
-	}
+	addAllFunctions(m, parseBuiltinAssets(p))
 	for _, preload := range state.Config.Parse.PreloadBuildDefs {
 		if stmts, err := p.ParseFileOnly(preload); err != nil {
-			addAllFunctions(m, stmts, false)
+			addAllFunctions(m, prepareFunctions(stmts, false))
 		}
 	}
 	for _, dir := range state.Config.Parse.BuildDefsDir {
@@ -67,7 +73,7 @@ func AllBuiltinFunctions(state *core.BuildState) map[string]*asp.Statement {
 			for _, file := range files {
 				if !file.IsDir() {
 					if stmts, err := p.ParseFileOnly(path.Join(dir, file.Name())); err == nil {
-						addAllFunctions(m, stmts, false)
+						addAllFunctions(m, prepareFunctions(stmts, false))
 					}
 				}
 			}
@@ -76,8 +82,41 @@ func AllBuiltinFunctions(state *core.BuildState) map[string]*asp.Statement {
 	return m
 }
 
-// addAllFunctions adds all the functions from a set of statements to the given map.
-func addAllFunctions(m map[string]*asp.Statement, stmts []*asp.Statement, builtin bool) {
+// helpBuiltinFunctions returns all the builtin functions for the current repo, computing them on the first call.
+func helpBuiltinFunctions() map[string]*asp.Statement {
+	helpFunctionsOnce.Do(func() {
+		helpFunctions = AllBuiltinFunctions(newState())
+	})
+	return helpFunctions
+}
+
+// parseBuiltinAssets returns the public function definitions from all the builtin rule assets,
+// parsing and preparing them on the first call. Other statements are dropped up front since we never
+// look at them. The returned statements are shared so must not be modified.
+func parseBuiltinAssets(p *asp.Parser) []*asp.Statement {
+	builtinAssetsOnce.Do(func() {
+		dir, _ := rules.AllAssets()
+		sort.Strings(dir)
+		for _, filename := range dir {
+			if filename != "builtins.build_defs" {
+				assetSrc, err := rules.ReadAsset(filename)
+				if err != nil {
+					log.Fatalf("Failed to read an asset %s", filename)
+				}
+				if stmts, err := p.ParseData(assetSrc, filename); err == nil {
+					builtinAssetStmts = append(builtinAssetStmts, prepareFunctions(stmts, true)...)
+				}
+			}
+		}
+	})
+	return builtinAssetStmts
+}
+
+// prepareFunctions returns the public, documented functions from a set of statements, with their
+// docstrings trimmed and private arguments removed. It modifies the statements, so must only be
+// called once for any given set.
+func prepareFunctions(stmts []*asp.Statement, builtin bool) []*asp.Statement {
+	ret := make([]*asp.Statement, 0, len(stmts))
 	for _, stmt := range stmts {
 		if f := stmt.FuncDef; f != nil && !f.IsPrivate && f.Docstring != "" {
 			f.Docstring = strings.TrimSpace(strings.Trim(f.Docstring, `"`))
@@ -89,14 +128,22 @@ func addAllFunctions(m map[string]*asp.Statement, stmts []*asp.Statement, builti
 				}
 			}
 			f.Arguments = args
-			m[f.Name] = stmt
+			ret = append(ret, stmt)
 		}
 	}
+	return ret
+}
+
+// addAllFunctions adds a set of statements returned by prepareFunctions to the given map.
+// It doesn't modify them, so it's safe to use with shared statements.
+func addAllFunctions(m map[string]*asp.Statement, stmts []*asp.Statement) {
+	for _, stmt := range stmts {
+		m[stmt.FuncDef.Name] = stmt
+	}
 }
 
 // getRuleArgs retrieves the arguments of builtin rules. It's split from PrintRuleArgs for testing.
 func getRuleArgs(state *core.BuildState) environment {
-	argsRegex := regexp.MustCompile("\n +Args: *\n")
 	env := environment{Functions: map[string]function{}}
 	for name, stmt := range AllBuiltinFunctions(state) {
 		f := stmt.FuncDef
@@ -104,19 +151,23 @@ func getRuleArgs(state *core.BuildState) environment {
 		if strings.HasSuffix(f.EoDef.Filename, "_rules.build_defs") {
 			r.Language = strings.TrimSuffix(f.EoDef.Filename, "_rules.build_defs")
 		}
+		args := r.Docstring
 		if indices := argsRegex.FindStringIndex(r.Docstring); indices != nil {
 			r.Comment = strings.TrimSpace(r.Docstring[:indices[0]])
+			args = r.Docstring[indices[1]:]
 		}
+		names := make(map[string]bool, len(f.Arguments))
+		for _, a := range f.Arguments {
+			names[a.Name] = true
+		}
+		comments := argComments(args, names)
 		r.Args = make([]functionArg, len(f.Arguments))
 		for i, a := range f.Arguments {
 			r.Args[i] = functionArg{
 				Name:     a.Name,
 				Types:    a.Type,
 				Required: a.Value == nil,
-			}
-			regex := regexp.MustCompile(a.Name + `(?: \(.*\))?: ((?s:.*))`)
-			if match := regex.FindStringSubmatch(r.Docstring); match != nil {
-				r.Args[i].Comment = filterMatch(match[1])
+				Comment:  comments[a.Name],
 			}
 		}
 		env.Functions[name] = r
@@ -145,16 +196,54 @@ type functionArg struct {
 	Types      []string `json:"types"`
 }
 
-// filterMatch filters a regex match to the part we want.
-// It's pretty much impossible to handle this as just a regex so we do it here instead.
-func filterMatch(match string) string {
-	lines := strings.Split(match, "\n")
-	regex := regexp.MustCompile(`^ *[a-z_]+(?: \([^)]+\))?:`)
-	for i, line := range lines {
-		if regex.MatchString(line) {
-			return strings.Join(lines[:i], " ")
+// argComments extracts the description of each of the named arguments from the Args section of a docstring.
+// It scans the section once; each description runs up to the start of the next argument.
+// Lines that look like the start of an argument but don't name one (e.g. "Note: ...") are treated
+// as part of the preceding description.
+func argComments(args string, names map[string]bool) map[string]string {
+	matches := argRegex.FindAllStringSubmatchIndex(args, -1)
+	n := 0
+	for _, match := range matches {
+		if names[args[match[2]:match[3]]] {
+			matches[n] = match
+			n++
+		}
+	}
+	matches = matches[:n]
+	comments := make(map[string]string, len(matches))
+	for i, match := range matches {
+		end := len(args)
+		if i+1 < len(matches) {
+			end = matches[i+1][0]
+		}
+		if name := args[match[2]:match[3]]; comments[name] == "" {
+			comments[name] = joinLines(args[match[1]:end])
+		}
+	}
+	return comments
+}
+
+// joinLines joins a multiline description into a single line.
+// It works through the string by index so it doesn't need to build a slice of lines first.
+func joinLines(s string) string {
+	if strings.IndexByte(s, '\n') == -1 {
+		return strings.TrimSpace(s)
+	}
+	var b strings.Builder
+	b.Grow(len(s))
+	for s != "" {
+		line := s
+		if idx := strings.IndexByte(s, '\n'); idx != -1 {
+			line, s = s[:idx], s[idx+1:]
+		} else {
+			s = ""
+		}
+		if line = strings.TrimSpace(line); line != "" {
+			if b.Len() > 0 {
+				b.WriteByte(' ')
+			}
+			b.WriteString(line)
 		}
-		lines[i] = strings.TrimSpace(line)
 	}
-	return strings.TrimSpace(match)
+	return b.String()
 }
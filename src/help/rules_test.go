@@ -38,3 +38,32 @@ func TestMultilineComment(t *testing.T) {
 	rule := env.Functions["new_http_archive"]
 	assert.True(t, strings.Count(rule.Comment, "\n") > 1)
 }
+
+func TestArgComments(t *testing.T) {
+	comments := argComments(`      name (str): Name of the rule
+      srcs (list | dict): Sources to compile.
+                          These can be split over
+                          multiple lines.
+      deps: Dependencies
+      py3_only (bool): Only build for Python 3.
+                       Note: this isn't an argument.
+      JAVA_HOME (str): Where Java lives.
+`, map[string]bool{"name": true, "srcs": true, "deps": true, "py3_only": true, "JAVA_HOME": true})
+	assert.Equal(t, map[string]string{
+		"name":      "Name of the rule",
+		"srcs":      "Sources to compile. These can be split over multiple lines.",
+		"deps":      "Dependencies",
+		"py3_only":  "Only build for Python 3. Note: this isn't an argument.",
+		"JAVA_HOME": "Where Java lives.",
+	}, comments)
+}
+
+func TestAllBuiltinFunctionsDoesNotModifySharedStatements(t *testing.T) {
+	state := core.NewDefaultBuildState()
+	f := AllBuiltinFunctions(state)["go_library"].FuncDef
+	docstring := f.Docstring
+	args := f.Arguments
+	f2 := AllBuiltinFunctions(state)["go_library"].FuncDef
+	assert.Equal(t, docstring, f2.Docstring)
+	assert.Equal(t, args, f2.Arguments)
+}
@@ -12,6 +12,7 @@ import (
 
 	"github.com/Masterminds/semver/v3"
 	"github.com/manifoldco/promptui"
+	"gopkg.in/op/go-logging.v1"
 
 	"github.com/thought-machine/please/src/cli"
 	"github.com/thought-machine/please/src/core"
@@ -91,7 +92,7 @@ func registerBuiltins(s *scope) {
 	}
 	configMethods = map[string]*pyFunc{
 		"get":        setNativeCode(s, "config_get", configGet),
-		"setdefault": s.Lookup("setdefault").(*pyFunc),
+		"setdefault": setNativeCode(s, "config_setdefault", configSetDefault),
 	}
 	if s.state.Config.Parse.GitFunctions {
 		setNativeCode(s, "git_branch", execGitBranch)
@@ -99,12 +100,12 @@ func registerBuiltins(s *scope) {
 		setNativeCode(s, "git_show", execGitShow)
 		setNativeCode(s, "git_state", execGitState)
 	}
-	setLogCode(s, "debug", log.Debug)
-	setLogCode(s, "info", log.Info)
-	setLogCode(s, "notice", log.Notice)
-	setLogCode(s, "warning", log.Warning)
-	setLogCode(s, "error", log.Errorf)
-	setLogCode(s, "fatal", log.Fatalf)
+	setLogCode(s, "debug", logging.DEBUG, log.Debug)
+	setLogCode(s, "info", logging.INFO, log.Info)
+	setLogCode(s, "notice", logging.NOTICE, log.Notice)
+	setLogCode(s, "warning", logging.WARNING, log.Warning)
+	setLogCode(s, "error", logging.ERROR, log.Errorf)
+	setLogCode(s, "fatal", logging.CRITICAL, log.Fatalf)
 }
 
 // registerSubincludePackage sets up the package for remote subincludes.
@@ -133,14 +134,24 @@ func setNativeCode(s *scope, name string, code nativeFunc) *pyFunc {
 }
 
 // setLogCode specialises setNativeCode for handling the log functions (of which there are a few)
-func setLogCode(s *scope, name string, f func(format string, args ...interface{})) {
+func setLogCode(s *scope, name string, level logging.Level, f func(format string, args ...interface{})) {
 	setNativeCode(s, name, func(s *scope, args []pyObject) pyObject {
+		// Don't bother formatting messages that won't be logged (debug() in particular is often
+		// called from build definitions). fatal() has to go through regardless since it exits.
+		if level != logging.CRITICAL && !log.IsEnabledFor(level) {
+			return None
+		}
 		if str, ok := args[0].(pyString); ok {
-			l := make([]interface{}, len(args))
-			for i, arg := range args {
+			if len(args) == 1 && !strings.ContainsRune(string(str), '%') {
+				// A plain message with nothing to interpolate, which is the usual case.
+				f("//%s: %s", s.pkgFilename(), string(str))
+				return None
+			}
+			l := make([]interface{}, len(args)-1)
+			for i, arg := range args[1:] {
 				l[i] = arg
 			}
-			f("//%s: %s", s.pkgFilename(), fmt.Sprintf(string(str), l[1:]...))
+			f("//%s: %s", s.pkgFilename(), fmt.Sprintf(string(str), l...))
 			return None
 		}
 		f("//%s: %s", s.pkgFilename(), args)
@@ -163,7 +174,9 @@ func buildRule(s *scope, args []pyObject) pyObject {
 	args[sandboxBuildRuleArgIdx] = defaultFromConfig(s.config, args[sandboxBuildRuleArgIdx], "BUILD_SANDBOX")
 	args[testSandboxBuildRuleArgIdx] = defaultFromConfig(s.config, args[testSandboxBuildRuleArgIdx], "TEST_SANDBOX")
 	target := createTarget(s, args)
-	s.Assert(s.pkg.Target(target.Label.Name) == nil, "Duplicate build target in %s: %s", s.pkg.Name, target.Label.Name)
+	if s.pkg.Target(target.Label.Name) != nil {
+		s.Error("Duplicate build target in %s: %s", s.pkg.Name, target.Label.Name)
+	}
 	populateTarget(s, target, args)
 	s.state.AddTarget(s.pkg, target)
 	if s.Callback {
@@ -190,10 +203,15 @@ func filegroup(s *scope, args []pyObject) pyObject {
 // pkg implements the package() builtin function.
 func pkg(s *scope, args []pyObject) pyObject {
 	s.Assert(s.pkg.NumTargets() == 0, "package() must be called before any build targets are defined")
+	if s.config.overlay == nil && len(s.locals) > 0 {
+		s.config.overlay = make(pyDict, len(s.locals))
+	}
 	for k, v := range s.locals {
 		k = strings.ToUpper(k)
-		s.Assert(s.config.Get(k, nil) != nil, "error calling package(): %s is not a known config value", k)
-		s.config.IndexAssign(pyString(k), v)
+		if s.config.Get(k, nil) == nil {
+			s.Error("error calling package(): %s is not a known config value", k)
+		}
+		s.config.set(k, v)
 	}
 	return None
 }
@@ -488,7 +506,8 @@ func strType(s *scope, args []pyObject) pyObject {
 
 func glob(s *scope, args []pyObject) pyObject {
 	include := asStringList(s, args[0], "include")
-	exclude := asStringList(s, args[1], "exclude")
+	// BUILD files are always excluded; leave room for them rather than reallocating to add them.
+	exclude := asStringListWithCap(s, args[1], "exclude", len(s.state.Config.Parse.BuildFileName))
 	hidden := args[2].IsTruthy()
 	exclude = append(exclude, s.state.Config.Parse.BuildFileName...)
 	if s.globber == nil {
@@ -498,12 +517,21 @@ func glob(s *scope, args []pyObject) pyObject {
 }
 
 func asStringList(s *scope, arg pyObject, name string) []string {
+	return asStringListWithCap(s, arg, name, 0)
+}
+
+// asStringListWithCap is like asStringList but leaves capacity for extra more items to be appended.
+func asStringListWithCap(s *scope, arg pyObject, name string, extra int) []string {
 	l, ok := arg.(pyList)
-	s.Assert(ok, "argument %s must be a list", name)
-	sl := make([]string, len(l))
+	if !ok {
+		s.Error("argument %s must be a list", name)
+	}
+	sl := make([]string, len(l), len(l)+extra)
 	for i, x := range l {
 		sx, ok := x.(pyString)
-		s.Assert(ok, "%s must be a list of strings", name)
+		if !ok {
+			s.Error("%s must be a list of strings", name)
+		}
 		sl[i] = string(sx)
 	}
 	return sl
@@ -522,6 +550,18 @@ func configGet(s *scope, args []pyObject) pyObject {
 	return self.Get(string(args[1].(pyString)), args[2])
 }
 
+// configSetDefault implements setdefault() for config objects natively, since it's called
+// a lot from build definitions to set default values.
+func configSetDefault(s *scope, args []pyObject) pyObject {
+	self := args[0].(*pyConfig)
+	key := string(args[1].(pyString))
+	if v := self.Get(key, nil); v != nil {
+		return v
+	}
+	self.set(key, args[2])
+	return args[2]
+}
+
 func dictGet(s *scope, args []pyObject) pyObject {
 	self := args[0].(pyDict)
 	sk, ok := args[1].(pyString)
@@ -728,11 +768,14 @@ func getLabelsInternal(target *core.BuildTarget, prefix string, minState core.Bu
 // Panics if the target is not in the current package or has already been built.
 func getTargetPost(s *scope, name string) *core.BuildTarget {
 	target := s.pkg.Target(name)
-	//nolint:staticcheck
-	s.Assert(target != nil, "Unknown build target %s in %s", name, s.pkg.Name)
+	if target == nil {
+		s.Error("Unknown build target %s in %s", name, s.pkg.Name)
+	}
 	// It'd be cheating to try to modify targets that're already built.
 	// Prohibit this because it'd likely end up with nasty race conditions.
-	s.Assert(target.State() < core.Built, "Attempted to modify target %s, but it's already built", target.Label) //nolint:staticcheck
+	if target.State() >= core.Built { //nolint:staticcheck
+		s.Error("Attempted to modify target %s, but it's already built", target.Label)
+	}
 	return target
 }
 
@@ -745,8 +788,9 @@ func addDep(s *scope, args []pyObject) pyObject {
 	target.AddMaybeExportedDependency(dep, exported, false, false)
 	// Queue this dependency if it'll be needed.
 	if target.State() > core.Inactive {
-		err := s.state.QueueTarget(dep, target.Label, true, false)
-		s.Assert(err == nil, "%s", err)
+		if err := s.state.QueueTarget(dep, target.Label, true, false); err != nil {
+			s.Error("%s", err)
+		}
 	}
 	// TODO(peterebden): Do we even need the following any more?
 	s.pkg.MarkTargetModified(target)
@@ -941,11 +985,23 @@ func breakpoint(s *scope, args []pyObject) pyObject {
 		}
 		return s.interpreter.interpretStatements(s, stmts)
 	}
+	// The prompt validates the input by parsing it; we keep the result of the last one so it
+	// doesn't have to be parsed again once it's submitted.
+	var lastInput string
+	var lastStmts []*Statement
+	var lastErr error
+	parse := func(input string) ([]*Statement, error) {
+		if input != lastInput || (lastStmts == nil && lastErr == nil) {
+			lastInput = input
+			lastStmts, lastErr = s.interpreter.parser.ParseData([]byte(input), "<stdin>")
+		}
+		return lastStmts, lastErr
+	}
 	for {
 		prompt := promptui.Prompt{
 			Label: "plz",
 			Validate: func(input string) error {
-				_, err := s.interpreter.parser.ParseData([]byte(input), "<stdin>")
+				_, err := parse(input)
 				return err
 			},
 		}
@@ -955,7 +1011,7 @@ func breakpoint(s *scope, args []pyObject) pyObject {
 			} else if err.Error() != "^C" {
 				log.Error("%s", err)
 			}
-		} else if stmts, err := s.interpreter.parser.ParseData([]byte(input), "<stdin>"); err != nil {
+		} else if stmts, err := parse(input); err != nil {
 			log.Error("Syntax error: %s", err)
 		} else if ret, err := interpretStatements(stmts); err != nil {
 			log.Error("%s", err)
@@ -1,6 +1,9 @@
 package asp
 
-import "fmt"
+import (
+	"fmt"
+	"sync"
+)
 
 // A FileInput is the top-level structure of a BUILD file.
 type FileInput struct {
@@ -67,6 +70,10 @@ type FuncDef struct {
 	IsPrivate bool
 	// True if the function is builtin to Please.
 	IsBuiltin bool
+	// Not part of the grammar. Argument metadata that's shared between all the function objects
+	// created from this definition (e.g. a closure defined inside a macro), computed on first use.
+	argsOnce sync.Once
+	args     *funcArgs
 }
 
 // A ForStatement implements the 'for' statement.
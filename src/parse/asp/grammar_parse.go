@@ -70,6 +70,8 @@ func parseFileInput(r io.Reader) (input *FileInput, err error) {
 	return input, nil
 }
 
+// assert fails with the given message if the condition is false.
+// As with scope.Assert, non-constant args allocate even when it passes.
 func (p *parser) assert(condition bool, pos Token, message string, args ...interface{}) {
 	if !condition {
 		p.fail(pos, message, args...)
@@ -389,7 +391,9 @@ func (p *parser) parseUnconditionalExpressionInPlace(e *Expression) {
 		// Hack for "not in" which needs an extra token.
 		p.l.Next()
 		tok = p.l.Peek()
-		p.assert(tok.Value == "in", tok, "expected 'in', not %s", tok.Value)
+		if tok.Value != "in" {
+			p.fail(tok, "expected 'in', not %s", tok.Value)
+		}
 		tok.Value = "not in"
 		p.endPos = tok.EndPos()
 	}
@@ -466,9 +470,13 @@ func (p *parser) parseValueExpression() *ValueExpression {
 			return concatStrings(ve, p.parseValueExpression())
 		}
 	} else if tok.Type == Int {
-		p.assert(len(tok.Value) < 19, tok, "int literal is too large: %s", tok)
+		if len(tok.Value) >= 19 {
+			p.fail(tok, "int literal is too large: %s", tok)
+		}
 		i, err := strconv.Atoi(tok.Value)
-		p.assert(err == nil, tok, "invalid int value %s", tok) // Theoretically the lexer shouldn't have fed us this...
+		if err != nil {
+			p.fail(tok, "invalid int value %s", tok) // Theoretically the lexer shouldn't have fed us this...
+		}
 		ve.Int = i
 		ve.IsInt = true
 		p.endPos = p.l.Next().EndPos()
@@ -515,8 +523,9 @@ func (p *parser) parseIdentStatement() *IdentStatement {
 	i := &IdentStatement{
 		Name: p.next(Ident).Value,
 	}
-	_, reserved := keywords[i.Name]
-	p.assert(!reserved, tok, "Cannot operate on keyword or constant %s", i.Name)
+	if _, reserved := keywords[i.Name]; reserved {
+		p.fail(tok, "Cannot operate on keyword or constant %s", i.Name)
+	}
 	if tok := p.l.Peek(); tok.Type == EOL {
 		return i
 	}
@@ -552,7 +561,9 @@ func (p *parser) parseIdentStatement() *IdentStatement {
 			Assign: p.parseExpression(),
 		}
 	default:
-		p.assert(tok.Value == "+=", tok, "Unexpected token %s, expected one of , [ . ( = +=", tok)
+		if tok.Value != "+=" {
+			p.fail(tok, "Unexpected token %s, expected one of , [ . ( = +=", tok)
+		}
 		i.Action = &IdentStatementAction{
 			AugAssign: p.parseExpression(),
 		}
@@ -598,7 +609,9 @@ func (p *parser) parseCall() *Call {
 			arg.Name = tok.Value
 			p.next(Ident)
 			p.next('=')
-			p.assert(!names[arg.Name], tok, "Repeated argument %s", arg.Name)
+			if names[arg.Name] {
+				p.fail(tok, "Repeated argument %s", arg.Name)
+			}
 			names[arg.Name] = true
 		}
 		p.parseExpressionInPlace(&arg.Value)
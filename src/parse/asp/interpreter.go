@@ -18,6 +18,7 @@ type interpreter struct {
 	scope           *scope
 	parser          *Parser
 	subincludes     map[string]pyDict
+	parsing         map[string]*parsedSubinclude
 	config          map[*core.Configuration]*pyConfig
 	mutex           sync.RWMutex
 	configMutex     sync.RWMutex
@@ -38,6 +39,7 @@ func newInterpreter(state *core.BuildState, p *Parser) *interpreter {
 		scope:       s,
 		parser:      p,
 		subincludes: map[string]pyDict{},
+		parsing:     map[string]*parsedSubinclude{},
 		config:      map[*core.Configuration]*pyConfig{},
 		limiter:     make(semaphore, state.Config.Parse.NumThreads),
 		profiling:   state.Config.Profiling,
@@ -83,25 +85,29 @@ func (i *interpreter) loadBuiltinStatements(s *scope, statements []*Statement, e
 	if err != nil {
 		return err
 	}
-	i.optimiseExpressions(statements)
-	_, err = i.interpretStatements(s, i.parser.optimise(statements))
+	_, err = i.interpretStatements(s, i.optimise(statements))
 	return err
 }
 
 // interpretAll runs a series of statements in the context of the given package.
+// Several blocks of statements can be given (e.g. a preamble followed by the BUILD file itself),
+// in which case they are run in order in the same scope.
 // The first return value is for testing only.
-func (i *interpreter) interpretAll(pkg *core.Package, statements []*Statement) (s *scope, err error) {
+func (i *interpreter) interpretAll(pkg *core.Package, blocks ...[]*Statement) (s *scope, err error) {
 	s = i.scope.NewPackagedScope(pkg, 1)
+	s.shareIncludes = true
 	// Config needs a little separate tweaking.
 	// Annoyingly we'd like to not have to do this at all, but it's very hard to handle
 	// mutating operations like .setdefault() otherwise.
 	s.config = i.pkgConfig(pkg).Copy()
 	s.Set("CONFIG", s.config)
-	_, err = i.interpretStatements(s, statements)
-	if err == nil {
-		s.Callback = true // From here on, if anything else uses this scope, it's in a post-build callback.
+	for _, statements := range blocks {
+		if _, err = i.interpretStatements(s, statements); err != nil {
+			return s, err
+		}
 	}
-	return s, err
+	s.Callback = true // From here on, if anything else uses this scope, it's in a post-build callback.
+	return s, nil
 }
 
 // interpretStatements runs a series of statements in the context of the given scope.
@@ -128,21 +134,18 @@ func (i *interpreter) Subinclude(path string, label core.BuildLabel, pkg *core.P
 		return globals
 	}
 	// If we get here, it's not been subincluded already. Parse it now.
-	// Note that there is a race here whereby it's possible for two packages to parse the same
+	// Note that there is a race here whereby it's possible for two packages to interpret the same
 	// subinclude simultaneously - this doesn't matter since they'll get different but equivalent
-	// scopes, and sooner or later things will sort themselves out.
-	stmts, err := i.parser.parse(path)
-	if err != nil {
-		panic(err) // We're already inside another interpreter, which will handle this for us.
-	}
-	stmts = i.parser.optimise(stmts)
+	// scopes, and sooner or later things will sort themselves out. We don't wait for the other
+	// package to finish since interpreting can block on building targets, but we do at least
+	// share the parsed statements between them.
+	stmts := i.parseSubinclude(path)
 	s := i.scope.NewScope()
 	s.contextPkg = pkg
 	s.subincludeLabel = &label
 	// Scope needs a local version of CONFIG
 	s.config = i.scope.config.Copy()
 	s.Set("CONFIG", s.config)
-	i.optimiseExpressions(stmts)
 	s.interpretStatements(stmts)
 	locals := s.Freeze()
 	if s.config.overlay == nil {
@@ -151,9 +154,42 @@ func (i *interpreter) Subinclude(path string, label core.BuildLabel, pkg *core.P
 	i.mutex.Lock()
 	defer i.mutex.Unlock()
 	i.subincludes[path] = locals
+	delete(i.parsing, path) // Nobody will need these again now.
 	return s.locals
 }
 
+// A parsedSubinclude holds the statements of a subinclude that's in the process of being interpreted.
+type parsedSubinclude struct {
+	once  sync.Once
+	stmts []*Statement
+	err   error
+}
+
+// parseSubinclude parses and optimises the given subinclude file. If several packages are
+// subincluding it at once, only one of them will parse it.
+// It panics on any failure to parse.
+func (i *interpreter) parseSubinclude(path string) []*Statement {
+	i.mutex.Lock()
+	p, present := i.parsing[path]
+	if !present {
+		p = &parsedSubinclude{}
+		i.parsing[path] = p
+	}
+	i.mutex.Unlock()
+	p.once.Do(func() {
+		stmts, err := i.parser.parse(path)
+		if err != nil {
+			p.err = err
+			return
+		}
+		p.stmts = i.optimise(stmts)
+	})
+	if p.err != nil {
+		panic(p.err) // We're already inside another interpreter, which will handle this for us.
+	}
+	return p.stmts
+}
+
 // getConfig returns a new configuration object for the given configuration object.
 func (i *interpreter) getConfig(state *core.BuildState) *pyConfig {
 	i.configMutex.RLock()
@@ -164,6 +200,11 @@ func (i *interpreter) getConfig(state *core.BuildState) *pyConfig {
 	i.configMutex.RUnlock()
 	i.configMutex.Lock()
 	defer i.configMutex.Unlock()
+	// Check again; another package may have got here first while we didn't hold the lock.
+	// newConfig reflects over the whole config so it's worth not doing it more than once.
+	if c, present := i.config[state.Config]; present {
+		return c
+	}
 	c := newConfig(state)
 	i.config[state.Config] = c
 	return c
@@ -177,26 +218,37 @@ func (i *interpreter) pkgConfig(pkg *core.Package) *pyConfig {
 	return i.getConfig(i.scope.state)
 }
 
-// optimiseExpressions implements a peephole optimiser for expressions by precalculating constants
-// and identifying simple local variable lookups.
-func (i *interpreter) optimiseExpressions(stmts []*Statement) {
-	WalkAST(stmts, func(expr *Expression) bool {
-		if constant := i.scope.Constant(expr); constant != nil {
-			expr.Optimised = &OptimisedExpression{Constant: constant} // Extract constant expression
+// optimise applies the parser's statement rewrites (see Parser.optimise) and a peephole optimiser for
+// expressions which precalculates constants and identifies simple local variable lookups.
+// Both are done in a single walk of the AST.
+func (i *interpreter) optimise(stmts []*Statement) []*Statement {
+	stmts = optimiseStatements(stmts)
+	WalkAST(stmts, func(stmt *Statement) bool {
+		// Rewrite any nested blocks before the walk descends into them.
+		optimiseBlocks(stmt, optimiseStatements)
+		return true
+	}, i.optimiseExpression)
+	return stmts
+}
+
+// optimiseExpression implements a peephole optimisation on a single expression, replacing it
+// with a constant, a local variable lookup or a config property if it is only one of those.
+func (i *interpreter) optimiseExpression(expr *Expression) bool {
+	if constant := i.scope.Constant(expr); constant != nil {
+		expr.Optimised = &OptimisedExpression{Constant: constant} // Extract constant expression
+		expr.Val = nil
+		return false
+	} else if expr.Val != nil && expr.Val.Ident != nil && expr.Val.Call == nil && expr.Op == nil && expr.If == nil && len(expr.Val.Slices) == 0 {
+		if expr.Val.Property == nil && len(expr.Val.Ident.Action) == 0 {
+			expr.Optimised = &OptimisedExpression{Local: expr.Val.Ident.Name}
+			return false
+		} else if expr.Val.Ident.Name == "CONFIG" && len(expr.Val.Ident.Action) == 1 && expr.Val.Ident.Action[0].Property != nil && len(expr.Val.Ident.Action[0].Property.Action) == 0 {
+			expr.Optimised = &OptimisedExpression{Config: expr.Val.Ident.Action[0].Property.Name}
 			expr.Val = nil
 			return false
-		} else if expr.Val != nil && expr.Val.Ident != nil && expr.Val.Call == nil && expr.Op == nil && expr.If == nil && len(expr.Val.Slices) == 0 {
-			if expr.Val.Property == nil && len(expr.Val.Ident.Action) == 0 {
-				expr.Optimised = &OptimisedExpression{Local: expr.Val.Ident.Name}
-				return false
-			} else if expr.Val.Ident.Name == "CONFIG" && len(expr.Val.Ident.Action) == 1 && expr.Val.Ident.Action[0].Property != nil && len(expr.Val.Ident.Action[0].Property.Action) == 0 {
-				expr.Optimised = &OptimisedExpression{Config: expr.Val.Ident.Action[0].Property.Name}
-				expr.Val = nil
-				return false
-			}
 		}
-		return true
-	})
+	}
+	return true
 }
 
 // A scope contains all the information about a lexical scope.
@@ -216,6 +268,11 @@ type scope struct {
 	contextPkg *core.Package
 	// The label that was passed to subinclude(...)
 	subincludeLabel *core.BuildLabel
+	// Globals of files subincluded into this scope, most recent last. These are shared between every
+	// package that subincludes the same file, so package scopes look them up in place rather than
+	// copying them all into their own locals.
+	included      []pyDict
+	shareIncludes bool
 }
 
 // NewScope creates a new child scope of this one.
@@ -250,6 +307,9 @@ func (s *scope) Error(msg string, args ...interface{}) pyObject {
 }
 
 // Assert emits an error that stops further interpretation if the given condition is false.
+// Note that any arguments are boxed for the call regardless of the condition, which allocates
+// for anything other than constants; on hot paths (e.g. per item of a build rule argument)
+// it's better to test the condition and call Error explicitly.
 func (s *scope) Assert(condition bool, msg string, args ...interface{}) {
 	if !condition {
 		s.Error(msg, args...)
@@ -268,7 +328,13 @@ func (s *scope) NAssert(condition bool, msg string, args ...interface{}) {
 func (s *scope) Lookup(name string) pyObject {
 	if obj, present := s.locals[name]; present {
 		return obj
-	} else if s.parent != nil {
+	}
+	for i := len(s.included) - 1; i >= 0; i-- {
+		if obj, present := s.included[i][name]; present {
+			return obj
+		}
+	}
+	if s.parent != nil {
 		return s.parent.Lookup(name)
 	}
 	return s.Error("name '%s' is not defined", name)
@@ -290,6 +356,19 @@ func (s *scope) Set(name string, value pyObject) {
 // SetAll sets all contents of the given dict in this scope.
 // Optionally it can filter to just public objects (i.e. those not prefixed with an underscore)
 func (s *scope) SetAll(d pyDict, publicOnly bool) {
+	if s.shareIncludes && !publicOnly {
+		s.include(d)
+		return
+	}
+	if len(d) > len(s.locals) {
+		// Subincludes typically bring in far more than the package defines itself, so size
+		// the map once up front instead of growing it repeatedly as we go.
+		locals := make(pyDict, len(s.locals)+len(d))
+		for k, v := range s.locals {
+			locals[k] = v
+		}
+		s.locals = locals
+	}
 	for k, v := range d {
 		if k == "CONFIG" {
 			// Special case; need to merge config entries rather than overwriting the entire object.
@@ -302,12 +381,37 @@ func (s *scope) SetAll(d pyDict, publicOnly bool) {
 	}
 }
 
+// include adds the given frozen globals to this scope without copying them.
+// Anything already defined locally with the same name is removed so the included value takes
+// precedence, as it would if it had been assigned.
+func (s *scope) include(d pyDict) {
+	if v, present := d["CONFIG"]; present {
+		// As in SetAll, config entries are merged rather than replacing the entire object.
+		c, ok := v.(*pyFrozenConfig)
+		s.Assert(ok, "incoming CONFIG isn't a config object")
+		s.config.Merge(c)
+	}
+	for k := range s.locals {
+		if _, present := d[k]; present && k != "CONFIG" {
+			delete(s.locals, k)
+		}
+	}
+	s.included = append(s.included, d)
+}
+
 // Freeze freezes the contents of this scope, preventing mutable objects from being changed.
 // It returns the newly frozen set of locals.
 func (s *scope) Freeze() pyDict {
 	for k, v := range s.locals {
-		if f, ok := v.(freezable); ok {
-			s.locals[k] = f.Freeze()
+		// Most locals are functions, which we can skip quickly by checking concrete types
+		// rather than asserting to an interface.
+		switch o := v.(type) {
+		case pyList:
+			s.locals[k] = o.Freeze()
+		case pyDict:
+			s.locals[k] = o.Freeze()
+		case *pyConfig:
+			s.locals[k] = o.Freeze()
 		}
 	}
 	return s.locals
@@ -26,3 +26,13 @@ func BenchmarkParseFile(b *testing.B) {
 		}
 	}
 }
+
+func BenchmarkParseFileOnly(b *testing.B) {
+	b.ReportAllocs()
+	parser := NewParser(core.NewDefaultBuildState())
+	for i := 0; i < b.N; i++ {
+		if _, err := parser.ParseFileOnly("src/parse/asp/test_data/benchmark_parse_file.build"); err != nil {
+			panic(err)
+		}
+	}
+}
@@ -32,8 +32,7 @@ func parseFileToStatementsInPkg(filename string, pkg *core.Package) (*scope, []*
 	if err != nil {
 		panic(err)
 	}
-	statements = parser.optimise(statements)
-	parser.interpreter.optimiseExpressions(statements)
+	statements = parser.interpreter.optimise(statements)
 	s, err := parser.interpreter.interpretAll(pkg, statements)
 	return s, statements, err
 }
@@ -281,6 +280,19 @@ func TestInterpreterSubincludeConfig(t *testing.T) {
 	assert.EqualValues(t, "test test", s.config.Get("test", None))
 }
 
+func TestInterpreterSubincludeShadowing(t *testing.T) {
+	s, err := parseFile("src/parse/asp/test_data/interpreter/partition.build")
+	assert.NoError(t, err)
+	pkg := core.NewPackage("test")
+	s.Set("x", pyString("local"))
+	s.SetAll(s.interpreter.Subinclude("src/parse/asp/test_data/interpreter/subinclude_shadow.build", pkg.Label(), pkg), false)
+	s.Set("y", pyString("local"))
+	// Subincluded values replace anything defined before, but can be reassigned afterwards.
+	assert.EqualValues(t, "included", s.Lookup("x"))
+	assert.EqualValues(t, "local", s.Lookup("y"))
+	assert.EqualValues(t, "27", s.Lookup("major"))
+}
+
 func TestInterpreterValidateReturnVal(t *testing.T) {
 	s, err := parseFile("src/parse/asp/test_data/return_type.build")
 	assert.NotNil(t, s.Lookup("subinclude"))
@@ -1,6 +1,7 @@
 package asp
 
 import (
+	"bytes"
 	"io"
 	"io/ioutil"
 	"unicode"
@@ -61,7 +62,7 @@ func NameOfReader(r io.Reader) string {
 func newLexer(r io.Reader) *lex {
 	// Read the entire file upfront to avoid bufio etc.
 	// This should work OK as long as BUILD files are relatively small.
-	b, err := ioutil.ReadAll(r)
+	b, err := readAll(r)
 	if err != nil {
 		fail(Position{Filename: NameOfReader(r)}, err.Error())
 	}
@@ -74,6 +75,7 @@ func newLexer(r io.Reader) *lex {
 		b:        append(b, 0, 0), // Null-terminating the buffer makes things easier later.
 		filename: NameOfReader(r),
 		indents:  []int{0},
+		interned: map[string]string{},
 	}
 	l.Next() // Initial value is zero, this forces it to populate itself.
 	// Discard any leading newlines, they are just an annoyance.
@@ -83,6 +85,29 @@ func newLexer(r io.Reader) *lex {
 	return l
 }
 
+// readAll reads the entirety of the given reader. If it's seekable we size the buffer up front,
+// leaving room for the bytes newLexer appends, so it doesn't get reallocated as it's read.
+func readAll(r io.Reader) ([]byte, error) {
+	s, ok := r.(io.Seeker)
+	if !ok {
+		return ioutil.ReadAll(r)
+	}
+	current, err := s.Seek(0, io.SeekCurrent)
+	if err != nil {
+		return ioutil.ReadAll(r)
+	}
+	end, err := s.Seek(0, io.SeekEnd)
+	if err != nil {
+		return nil, err
+	} else if _, err := s.Seek(current, io.SeekStart); err != nil {
+		return nil, err
+	}
+	var buf bytes.Buffer
+	buf.Grow(int(end-current) + bytes.MinRead)
+	_, err = buf.ReadFrom(r)
+	return buf.Bytes(), err
+}
+
 // A lex is a lexer for a single BUILD file.
 type lex struct {
 	b      []byte
@@ -102,6 +127,8 @@ type lex struct {
 	indents []int
 	// Remember whether the last token we output was an end-of-line so we don't emit multiple in sequence.
 	lastEOL bool
+	// Identifiers and string literals we've already seen in this file.
+	interned map[string]string
 }
 
 // reverseSymbol looks up a symbol's name from the lexer.
@@ -251,11 +278,14 @@ func (l *lex) nextToken() Token {
 	case ',', '.', '%', '*', '|', '&', ':', '/':
 		return Token{Type: rune(b), Value: string(b), Pos: pos}
 	case '#':
-		// Comment character, consume to end of line.
-		for l.b[l.i] != '\n' && l.b[l.i] != 0 {
-			l.i++
-			l.col++
+		// Comment character, consume to end of line. IndexByte is a lot quicker than stepping
+		// through a byte at a time; there's always a newline left since newLexer ensures it.
+		n := bytes.IndexByte(l.b[l.i:], '\n')
+		if z := bytes.IndexByte(l.b[l.i:l.i+n], 0); z != -1 {
+			n = z
 		}
+		l.i += n
+		l.col += n
 		return l.nextToken() // Comments aren't tokens themselves.
 	case '-':
 		// We lex unary - with the integer if possible.
@@ -324,11 +354,11 @@ func (l *lex) consumeString(quote byte, pos Position, multiline, raw, fString bo
 					l.i += 2
 					l.col += 2
 				}
-				token := Token{Type: String, Value: string(s), Pos: pos}
 				if fString {
-					token.Value = "f" + token.Value
+					return Token{Type: String, Value: "f" + string(s), Pos: pos}
 				}
-				return token
+				// String literals (labels, visibility etc) are heavily repeated too, so share them as for identifiers.
+				return Token{Type: String, Value: l.intern(s), Pos: pos}
 			}
 		case '\n':
 			if multiline {
@@ -354,34 +384,44 @@ func (l *lex) consumeString(quote byte, pos Position, multiline, raw, fString bo
 
 // consumeIdent consumes all characters of an identifier.
 func (l *lex) consumeIdent(pos Position) Token {
-	s := make([]rune, 0, 100)
+	start := l.i
 	for {
 		c := rune(l.b[l.i])
 		if c >= utf8.RuneSelf {
 			// Multi-byte encoded in utf-8.
 			r, n := utf8.DecodeRune(l.b[l.i:])
-			c = r
 			l.i += n
 			l.col += n
-			if !unicode.IsLetter(c) && !unicode.IsDigit(c) {
-				fail(pos, "Illegal Unicode identifier %c", c)
+			if !unicode.IsLetter(r) && !unicode.IsDigit(r) {
+				fail(pos, "Illegal Unicode identifier %c", r)
 			}
-			s = append(s, c)
 			continue
 		}
-		l.i++
-		l.col++
 		switch c {
+		case '_', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9':
+			l.i++
+			l.col++
 		case ' ':
 			// End of identifier, but no unconsuming needed.
-			return Token{Type: Ident, Value: string(s), Pos: pos}
-		case '_', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9':
-			s = append(s, c)
+			tok := Token{Type: Ident, Value: l.intern(l.b[start:l.i]), Pos: pos}
+			l.i++
+			l.col++
+			return tok
 		default:
-			// End of identifier. Unconsume the last character so it gets handled next time.
-			l.i--
-			l.col--
-			return Token{Type: Ident, Value: string(s), Pos: pos}
+			// End of identifier. The current character gets handled next time.
+			return Token{Type: Ident, Value: l.intern(l.b[start:l.i]), Pos: pos}
 		}
 	}
 }
+
+// intern returns the given identifier or string literal as a string, reusing the same one if
+// we've seen it before. The same few identifiers (name, srcs, deps etc) make up most of a typical
+// BUILD file so this saves allocating a new string for nearly all of them.
+func (l *lex) intern(b []byte) string {
+	if s, present := l.interned[string(b)]; present {
+		return s
+	}
+	s := string(b)
+	l.interned[s] = s
+	return s
+}
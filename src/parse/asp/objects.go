@@ -28,12 +28,6 @@ type pyObject interface {
 	IndexAssign(index, value pyObject)
 }
 
-// A freezable represents an object that can be frozen into a readonly state.
-// Not all pyObjects implement this.
-type freezable interface {
-	Freeze() pyObject
-}
-
 type pyBool bool
 
 // True and False are the singletons representing those values.
@@ -544,14 +538,44 @@ type pyFunc struct {
 	returnType string
 }
 
+// funcArgs is the argument metadata of a function that depends only on its definition.
+// It is never modified once created so can be shared between any number of pyFuncs.
+type funcArgs struct {
+	args       []string
+	argIndices map[string]int
+	types      [][]string
+}
+
+// funcArgs returns the argument metadata for this function definition.
+func (def *FuncDef) funcArgs() *funcArgs {
+	def.argsOnce.Do(func() {
+		a := &funcArgs{
+			args:       make([]string, len(def.Arguments)),
+			argIndices: make(map[string]int, len(def.Arguments)),
+			types:      make([][]string, len(def.Arguments)),
+		}
+		for i, arg := range def.Arguments {
+			a.args[i] = arg.Name
+			a.argIndices[arg.Name] = i
+			a.types[i] = arg.Type
+			for _, alias := range arg.Aliases {
+				a.argIndices[alias] = i
+			}
+		}
+		def.args = a
+	})
+	return def.args
+}
+
 func newPyFunc(parentScope *scope, def *FuncDef) pyObject {
+	a := def.funcArgs()
 	f := &pyFunc{
 		name:       def.Name,
 		scope:      parentScope,
-		args:       make([]string, len(def.Arguments)),
-		argIndices: make(map[string]int, len(def.Arguments)),
+		args:       a.args,
+		argIndices: a.argIndices,
 		constants:  make([]pyObject, len(def.Arguments)),
-		types:      make([][]string, len(def.Arguments)),
+		types:      a.types,
 		code:       def.Statements,
 		kwargsonly: def.KeywordsOnly,
 		returnType: def.Return,
@@ -560,9 +584,6 @@ func newPyFunc(parentScope *scope, def *FuncDef) pyObject {
 		f.docstring = stringLiteral(def.Docstring)
 	}
 	for i, arg := range def.Arguments {
-		f.args[i] = arg.Name
-		f.argIndices[arg.Name] = i
-		f.types[i] = arg.Type
 		if arg.Value != nil {
 			if constant := parentScope.Constant(arg.Value); constant != nil {
 				f.constants[i] = constant
@@ -574,9 +595,6 @@ func newPyFunc(parentScope *scope, def *FuncDef) pyObject {
 				f.defaults[i] = arg.Value
 			}
 		}
-		for _, alias := range arg.Aliases {
-			f.argIndices[alias] = i
-		}
 	}
 	return f
 }
@@ -628,14 +646,19 @@ func (f *pyFunc) Call(ctx context.Context, s *scope, c *Call) pyObject {
 		if a.Name != "" { // Named argument
 			name := a.Name
 			idx, present := f.argIndices[name]
-			s.Assert(present || f.kwargs, "Unknown argument to %s: %s", f.name, name)
+			if !present && !f.kwargs {
+				s.Error("Unknown argument to %s: %s", f.name, name)
+			}
 			if present {
 				name = f.args[idx]
 			}
 			s2.Set(name, f.validateType(s, idx, &a.Value))
 		} else {
-			s.NAssert(i >= len(f.args), "Too many arguments to %s", f.name)
-			s.NAssert(f.kwargsonly, "Function %s can only be called with keyword arguments", f.name)
+			if i >= len(f.args) {
+				s.Error("Too many arguments to %s", f.name)
+			} else if f.kwargsonly {
+				s.Error("Function %s can only be called with keyword arguments", f.name)
+			}
 			s2.Set(f.args[i], f.validateType(s, i, &a.Value))
 		}
 	}
@@ -660,7 +683,11 @@ func (f *pyFunc) Call(ctx context.Context, s *scope, c *Call) pyObject {
 // For performance reasons these are done differently - rather then receiving a pointer to a scope
 // they receive their arguments as a slice, in which unpassed arguments are nil.
 func (f *pyFunc) callNative(s *scope, c *Call) pyObject {
-	args := make([]pyObject, len(f.args))
+	n := len(f.args)
+	if f.varargs && len(c.Arguments) >= n {
+		n = len(c.Arguments) + 1 // Leave room for all of them (and self) so appending doesn't reallocate.
+	}
+	args := make([]pyObject, len(f.args), n)
 	offset := 0
 	if f.self != nil {
 		args[0] = f.self
@@ -676,10 +703,14 @@ func (f *pyFunc) callNative(s *scope, c *Call) pyObject {
 				s.Error("Unknown argument to %s: %s", f.name, a.Name)
 			}
 		} else if i >= len(args) {
-			s.Assert(f.varargs, "Too many arguments to %s", f.name)
+			if !f.varargs {
+				s.Error("Too many arguments to %s", f.name)
+			}
 			args = append(args, s.interpretExpression(&a.Value))
 		} else {
-			s.NAssert(f.kwargsonly, "Function %s can only be called with keyword arguments", f.name)
+			if f.kwargsonly {
+				s.Error("Function %s can only be called with keyword arguments", f.name)
+			}
 			if i+offset >= len(args) {
 				args = append(args, f.validateType(s, i+offset, &a.Value))
 			} else {
@@ -701,8 +732,9 @@ func (f *pyFunc) callNative(s *scope, c *Call) pyObject {
 func (f *pyFunc) defaultArg(s *scope, i int, arg string) pyObject {
 	if f.constants[i] != nil {
 		return f.constants[i]
+	} else if f.defaults == nil || f.defaults[i] == nil {
+		s.Error("Missing required argument to %s: %s", f.name, arg)
 	}
-	s.Assert(f.defaults != nil && f.defaults[i] != nil, "Missing required argument to %s: %s", f.name, arg)
 	return s.interpretExpression(f.defaults[i])
 }
 
@@ -801,7 +833,11 @@ func (c *pyConfig) Operator(operator Operator, operand pyObject) pyObject {
 }
 
 func (c *pyConfig) IndexAssign(index, value pyObject) {
-	key := string(index.(pyString))
+	c.set(string(index.(pyString)), value)
+}
+
+// set sets a single value in the overlay config.
+func (c *pyConfig) set(key string, value pyObject) {
 	if c.overlay == nil {
 		c.overlay = pyDict{key: value}
 	} else {
@@ -844,7 +880,9 @@ func (c *pyConfig) Freeze() pyObject {
 
 // Merge merges the contents of the given config object into this one.
 func (c *pyConfig) Merge(other *pyFrozenConfig) {
-	if c.overlay == nil {
+	if len(other.overlay) == 0 {
+		return // Nothing to do, and no need to allocate an overlay for it.
+	} else if c.overlay == nil {
 		// N.B. We cannot directly copy since this might get mutated again later on.
 		c.overlay = make(pyDict, len(other.overlay))
 	}
@@ -870,9 +908,17 @@ func newConfig(state *core.BuildState) *pyConfig {
 					case reflect.Bool:
 						c[tag] = newPyBool(subfield.Bool())
 					case reflect.Slice:
+						// Repeatable settings are always lists, even when empty, so nothing downstream
+						// needs to handle them being absent or a single string.
 						l := make(pyList, subfield.Len())
-						for i := 0; i < subfield.Len(); i++ {
-							l[i] = pyString(subfield.Index(i).String())
+						if strs, ok := subfield.Interface().([]string); ok {
+							for i, s := range strs {
+								l[i] = pyString(s)
+							}
+						} else {
+							for i := range l {
+								l[i] = pyString(subfield.Index(i).String())
+							}
 						}
 						c[tag] = l
 					case reflect.Struct:
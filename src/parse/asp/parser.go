@@ -8,6 +8,9 @@ import (
 	"io"
 	"os"
 	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
 
 	"gopkg.in/op/go-logging.v1"
 
@@ -29,6 +32,23 @@ type Parser struct {
 	builtins map[string][]byte
 	// Parallelism limiter to ensure we don't try to run too many parses simultaneously
 	limiter semaphore
+	// Cached statements for each preamble we've parsed.
+	preambles sync.Map
+	// Cached statements for BUILD files we've parsed, and how many of them there are.
+	files    sync.Map
+	numFiles int32
+}
+
+// maxCachedFiles is the most BUILD files we will cache parsed statements for. The same file
+// can be parsed more than once (e.g. for a package that's needed for several architectures) but
+// mostly it isn't, so there's no point retaining the statements of every file in a large repo.
+const maxCachedFiles = 4096
+
+// A parsedFile is the cached result of parsing a single BUILD file.
+type parsedFile struct {
+	stmts   []*Statement
+	modTime time.Time
+	size    int64
 }
 
 // NewParser creates a new parser instance. One is normally sufficient for a process lifetime.
@@ -75,21 +95,20 @@ func (p *Parser) ParseFile(pkg *core.Package, filename string, preamble string)
 	p.limiter.Acquire()
 	defer p.limiter.Release()
 
-	statements, err := p.parse(filename)
+	statements, err := p.parseCached(filename)
 	if err != nil {
 		return err
 	}
 
 	if preamble != "" {
-		stmts, err := p.parseAndHandleErrors(strings.NewReader(preamble))
-		if err != nil {
-			return err
+		stmts, perr := p.parsePreamble(preamble)
+		if perr != nil {
+			return perr
 		}
-
-		statements = append(stmts, statements...)
+		_, err = p.interpreter.interpretAll(pkg, stmts, statements)
+	} else {
+		_, err = p.interpreter.interpretAll(pkg, statements)
 	}
-
-	_, err = p.interpreter.interpretAll(pkg, statements)
 	if err != nil {
 		f, _ := os.Open(filename)
 		p.annotate(err, f)
@@ -97,6 +116,21 @@ func (p *Parser) ParseFile(pkg *core.Package, filename string, preamble string)
 	return err
 }
 
+// parsePreamble parses the given preamble to a BUILD file.
+// It's normally the same for every package so we only parse each distinct one once; the statements
+// are never modified by the interpreter so it's safe to share them.
+func (p *Parser) parsePreamble(preamble string) ([]*Statement, error) {
+	if stmts, present := p.preambles.Load(preamble); present {
+		return stmts.([]*Statement), nil
+	}
+	stmts, err := p.parseAndHandleErrors(strings.NewReader(preamble))
+	if err != nil {
+		return nil, err
+	}
+	p.preambles.Store(preamble, stmts)
+	return stmts, nil
+}
+
 // ParseReader parses the contents of the given ReadSeeker as a BUILD file.
 // The first return value is true if parsing succeeds - if the error is still non-nil
 // that indicates that interpretation failed.
@@ -132,6 +166,43 @@ func (p *Parser) parse(filename string) ([]*Statement, error) {
 	return stmts, err
 }
 
+// parseCached is like parse but reuses the statements from a previous parse of the same file,
+// as long as it doesn't appear to have changed since. The statements are never modified by
+// interpreting them so it's safe to share them between packages.
+func (p *Parser) parseCached(filename string) ([]*Statement, error) {
+	f, err := os.Open(filename)
+	if err != nil {
+		return nil, err
+	}
+	info, err := f.Stat()
+	if err != nil {
+		f.Close()
+		return nil, err
+	}
+	cached, present := p.files.Load(filename)
+	if present {
+		if pf := cached.(*parsedFile); pf.size == info.Size() && pf.modTime.Equal(info.ModTime()) {
+			f.Close()
+			return pf.stmts, nil
+		}
+	}
+	stmts, err := p.parseAndHandleErrors(f)
+	if err != nil {
+		return stmts, err // As in parse, the file is left open for the error to refer to.
+	}
+	f.Close()
+	pf := &parsedFile{stmts: stmts, modTime: info.ModTime(), size: info.Size()}
+	if present {
+		// This replaces an out-of-date entry so doesn't change how many files are cached.
+		p.files.Store(filename, pf)
+	} else if atomic.LoadInt32(&p.numFiles) < maxCachedFiles {
+		if _, loaded := p.files.LoadOrStore(filename, pf); !loaded {
+			atomic.AddInt32(&p.numFiles, 1)
+		}
+	}
+	return stmts, nil
+}
+
 // ParseData reads the given byteslice and parses it into a set of statements.
 // The 'filename' argument is only used in case of errors so doesn't necessarily have to correspond to a real file.
 func (p *Parser) ParseData(data []byte, filename string) ([]*Statement, error) {
@@ -164,20 +235,20 @@ func (p *Parser) annotate(err error, r io.ReadSeeker) error {
 // This also sneaks in some rewrites to .append and .extend which are very troublesome otherwise
 // (technically that changes the meaning of the code, #dealwithit)
 func (p *Parser) optimise(statements []*Statement) []*Statement {
+	statements = optimiseStatements(statements)
+	for _, stmt := range statements {
+		optimiseBlocks(stmt, p.optimise)
+	}
+	return statements
+}
+
+// optimiseStatements performs the optimisations described above on a single block of statements.
+// It does not descend into any nested blocks; see optimiseBlocks for that.
+func optimiseStatements(statements []*Statement) []*Statement {
 	ret := make([]*Statement, 0, len(statements))
 	for _, stmt := range statements {
 		if stmt.Literal != nil || stmt.Pass {
 			continue // Neither statement has any effect.
-		} else if stmt.FuncDef != nil {
-			stmt.FuncDef.Statements = p.optimise(stmt.FuncDef.Statements)
-		} else if stmt.For != nil {
-			stmt.For.Statements = p.optimise(stmt.For.Statements)
-		} else if stmt.If != nil {
-			stmt.If.Statements = p.optimise(stmt.If.Statements)
-			for i, elif := range stmt.If.Elif {
-				stmt.If.Elif[i].Statements = p.optimise(elif.Statements)
-			}
-			stmt.If.ElseStatements = p.optimise(stmt.If.ElseStatements)
 		} else if stmt.Ident != nil && stmt.Ident.Action != nil && stmt.Ident.Action.Property != nil && len(stmt.Ident.Action.Property.Action) == 1 {
 			call := stmt.Ident.Action.Property.Action[0].Call
 			name := stmt.Ident.Action.Property.Name
@@ -205,6 +276,30 @@ func (p *Parser) optimise(statements []*Statement) []*Statement {
 	return ret
 }
 
+// optimiseBlocks applies the given function to each block of statements nested directly within this one.
+func optimiseBlocks(stmt *Statement, f func([]*Statement) []*Statement) {
+	if stmt.FuncDef != nil {
+		stmt.FuncDef.Statements = f(stmt.FuncDef.Statements)
+	} else if stmt.For != nil {
+		stmt.For.Statements = f(stmt.For.Statements)
+	} else if stmt.If != nil {
+		stmt.If.Statements = f(stmt.If.Statements)
+		for i, elif := range stmt.If.Elif {
+			stmt.If.Elif[i].Statements = f(elif.Statements)
+		}
+		stmt.If.ElseStatements = f(stmt.If.ElseStatements)
+	}
+}
+
+// kwargsWhitelist is the set of built-in functions that are allowed to be called as non-kwargs.
+var kwargsWhitelist = map[string]bool{
+	"workspace":     true,
+	"decompose":     true,
+	"check_config":  true,
+	"select":        true,
+	"exports_files": true,
+}
+
 // whitelistedKwargs returns true if the given built-in function name is allowed to
 // be called as non-kwargs.
 // TODO(peterebden): Come up with a syntax that exposes this directly in the file.
@@ -212,11 +307,5 @@ func whitelistedKwargs(name, filename string) bool {
 	if name[0] == '_' || (strings.HasSuffix(filename, "builtins.build_defs") && name != "build_rule") {
 		return true // Don't care about anything private, or non-rule builtins.
 	}
-	return map[string]bool{
-		"workspace":     true,
-		"decompose":     true,
-		"check_config":  true,
-		"select":        true,
-		"exports_files": true,
-	}[name]
+	return kwargsWhitelist[name]
 }
@@ -1,6 +1,8 @@
 package asp
 
 import (
+	"io/ioutil"
+	"path/filepath"
 	"strings"
 	"testing"
 
@@ -790,3 +792,39 @@ func TestFStringIncompleteError(t *testing.T) {
 	require.Error(t, err)
 	assert.Contains(t, err.Error(), "Unterminated brace in fstring")
 }
+
+func TestParseFileIsCached(t *testing.T) {
+	p := newParser()
+	stmts, err := p.parseCached("src/parse/asp/test_data/basic.build")
+	require.NoError(t, err)
+	stmts2, err := p.parseCached("src/parse/asp/test_data/basic.build")
+	require.NoError(t, err)
+	assert.Same(t, stmts[0], stmts2[0])
+}
+
+func TestParseFileCacheReplacesChangedFiles(t *testing.T) {
+	p := newParser()
+	filename := filepath.Join(t.TempDir(), "BUILD")
+	require.NoError(t, ioutil.WriteFile(filename, []byte("x = 1\n"), 0644))
+	stmts, err := p.parseCached(filename)
+	require.NoError(t, err)
+	require.NoError(t, ioutil.WriteFile(filename, []byte("x = 1\ny = 2\n"), 0644))
+	stmts2, err := p.parseCached(filename)
+	require.NoError(t, err)
+	assert.Equal(t, 1, len(stmts))
+	assert.Equal(t, 2, len(stmts2))
+	// Re-parsing a changed file shouldn't count towards the limit again.
+	assert.EqualValues(t, 1, p.numFiles)
+}
+
+func TestParsePreambleIsCached(t *testing.T) {
+	p := newParser()
+	stmts, err := p.parsePreamble(`subinclude("//build_defs:go")`)
+	require.NoError(t, err)
+	require.Equal(t, 1, len(stmts))
+	stmts2, err := p.parsePreamble(`subinclude("//build_defs:go")`)
+	require.NoError(t, err)
+	assert.Same(t, stmts[0], stmts2[0])
+	_, err = p.parsePreamble(`subinclude(`)
+	assert.Error(t, err)
+}
@@ -74,11 +74,14 @@ func createTarget(s *scope, args []pyObject) *core.BuildTarget {
 	name := string(args[nameBuildRuleArgIdx].(pyString))
 	testCmd := args[testCMDBuildRuleArgIdx]
 	test := isTruthy(testBuildRuleArgIdx)
-	// A bunch of error checking first
-	s.NAssert(name == "all", "'all' is a reserved build target name.")
-	s.NAssert(name == "", "Target name is empty")
-	s.NAssert(strings.ContainsRune(name, '/'), "/ is a reserved character in build target names")
-	s.NAssert(strings.ContainsRune(name, ':'), ": is a reserved character in build target names")
+	// A bunch of error checking first. These almost never fail so check them all at once
+	// and only work out which one it was if we need to.
+	if name == "all" || name == "" || strings.ContainsAny(name, "/:") {
+		s.NAssert(name == "all", "'all' is a reserved build target name.")
+		s.NAssert(name == "", "Target name is empty")
+		s.NAssert(strings.ContainsRune(name, '/'), "/ is a reserved character in build target names")
+		s.NAssert(strings.ContainsRune(name, ':'), ": is a reserved character in build target names")
+	}
 
 	if tag := args[tagBuildRuleArgIdx]; tag != nil {
 		if tagStr := string(tag.(pyString)); tagStr != "" {
@@ -86,7 +89,9 @@ func createTarget(s *scope, args []pyObject) *core.BuildTarget {
 		}
 	}
 	label, err := core.TryNewBuildLabel(s.pkg.Name, name)
-	s.Assert(err == nil, "Invalid build target name %s", name)
+	if err != nil {
+		s.Error("Invalid build target name %s", name)
+	}
 	label.Subrepo = s.pkg.SubrepoName
 
 	target := core.NewBuildTarget(label)
@@ -199,6 +204,19 @@ func decodeCommands(s *scope, obj pyObject) (string, map[string]string) {
 	return "", m
 }
 
+// stringArgs are the arguments to build_rule that are plain lists of strings, and the method
+// that adds each item to the target.
+var stringArgs = []struct {
+	name string
+	idx  int
+	add  func(*core.BuildTarget, string)
+}{
+	{"labels", labelsBuildRuleArgIdx, (*core.BuildTarget).AddLabel},
+	{"hashes", hashesBuildRuleArgIdx, (*core.BuildTarget).AddHash},
+	{"licences", licencesBuildRuleArgIdx, (*core.BuildTarget).AddLicence},
+	{"requires", requiresBuildRuleArgIdx, (*core.BuildTarget).AddRequire},
+}
+
 // populateTarget sets the assorted attributes on a build target.
 func populateTarget(s *scope, t *core.BuildTarget, args []pyObject) {
 	if t.IsRemoteFile {
@@ -216,13 +234,22 @@ func populateTarget(s *scope, t *core.BuildTarget, args []pyObject) {
 	addMaybeNamedOutput(s, "outs", args[outsBuildRuleArgIdx], t.AddOutput, t.AddNamedOutput, t, false)
 	addMaybeNamedOutput(s, "optional_outs", args[optionalOutsBuildRuleArgIdx], t.AddOptionalOutput, nil, t, true)
 	addMaybeNamedOutput(s, "test_outputs", args[testOutputsBuildRuleArgIdx], t.AddTestOutput, nil, t, false)
+	t.GrowDependencies(listLen(args[depsBuildRuleArgIdx]) + listLen(args[exportedDepsBuildRuleArgIdx]) + listLen(args[internalDepsBuildRuleArgIdx]))
 	addDependencies(s, "deps", args[depsBuildRuleArgIdx], t, false, false)
 	addDependencies(s, "exported_deps", args[exportedDepsBuildRuleArgIdx], t, true, false)
 	addDependencies(s, "internal_deps", args[internalDepsBuildRuleArgIdx], t, false, true)
-	addStrings(s, "labels", args[labelsBuildRuleArgIdx], t.AddLabel)
-	addStrings(s, "hashes", args[hashesBuildRuleArgIdx], t.AddHash)
-	addStrings(s, "licences", args[licencesBuildRuleArgIdx], t.AddLicence)
-	addStrings(s, "requires", args[requiresBuildRuleArgIdx], t.AddRequire)
+	// Make room for these up front rather than growing them an item at a time.
+	t.Labels = growStrings(t.Labels, listLen(args[labelsBuildRuleArgIdx])+listLen(args[requiresBuildRuleArgIdx]))
+	t.Hashes = growStrings(t.Hashes, listLen(args[hashesBuildRuleArgIdx]))
+	if n := listLen(args[visibilityBuildRuleArgIdx]); n > 0 {
+		t.Visibility = make([]core.BuildLabel, 0, n)
+	}
+	for _, arg := range stringArgs {
+		if obj := args[arg.idx]; obj != nil && obj != None {
+			add := arg.add
+			addStrings(s, arg.name, obj, func(str string) { add(t, str) })
+		}
+	}
 	addStrings(s, "visibility", args[visibilityBuildRuleArgIdx], func(str string) {
 		t.Visibility = append(t.Visibility, parseVisibility(s, str))
 	})
@@ -230,11 +257,19 @@ func populateTarget(s *scope, t *core.BuildTarget, args []pyObject) {
 	addEnv(s, args[envArgIdx], t)
 	addMaybeNamedSecret(s, "secrets", args[secretsBuildRuleArgIdx], t.AddSecret, t.AddNamedSecret, t, true)
 	addProvides(s, "provides", args[providesBuildRuleArgIdx], t)
-	if f := callbackFunction(s, "pre_build", args[preBuildBuildRuleArgIdx], 1, "argument"); f != nil {
-		t.PreBuildFunction = &preBuildFunction{f: f, s: s}
+	// Very few targets have either of these so check for both together before going any further.
+	if pre, post := args[preBuildBuildRuleArgIdx], args[postBuildBuildRuleArgIdx]; (pre != nil && pre != None) || (post != nil && post != None) {
+		addCallbacks(s, t, pre, post)
+	}
+}
+
+// addCallbacks sets the pre- and post-build functions of a target, if they're given.
+func addCallbacks(s *scope, t *core.BuildTarget, pre, post pyObject) {
+	if f := callbackFunction(s, "pre_build", pre, 1, "argument"); f != nil {
+		t.PreBuildFunction = &preBuildFunction{f: f, config: s.config}
 	}
-	if f := callbackFunction(s, "post_build", args[postBuildBuildRuleArgIdx], 2, "arguments"); f != nil {
-		t.PostBuildFunction = &postBuildFunction{f: f, s: s}
+	if f := callbackFunction(s, "post_build", post, 2, "arguments"); f != nil {
+		t.PostBuildFunction = &postBuildFunction{f: f, config: s.config}
 	}
 }
 
@@ -246,7 +281,9 @@ func addEntryPoints(s *scope, arg pyObject, target *core.BuildTarget) {
 	entryPoints := make(map[string]string, len(entryPointsPy))
 	for name, entryPointPy := range entryPointsPy {
 		entryPoint, ok := entryPointPy.(pyString)
-		s.Assert(ok, "Values of entry_points must be strings, found %v at key %v", entryPointPy.Type(), name)
+		if !ok {
+			s.Error("Values of entry_points must be strings, found %v at key %v", entryPointPy.Type(), name)
+		}
 		s.Assert(target.NamedOutputs(entryPoint.String()) == nil, "Entry points can't have the same name as a named output")
 		entryPoints[name] = string(entryPoint)
 	}
@@ -258,11 +295,16 @@ func addEntryPoints(s *scope, arg pyObject, target *core.BuildTarget) {
 func addEnv(s *scope, arg pyObject, target *core.BuildTarget) {
 	envPy, ok := asDict(arg)
 	s.Assert(ok, "env must be a dict")
+	if len(envPy) == 0 {
+		return // Most targets don't set any, no point allocating an empty map for them.
+	}
 
 	env := make(map[string]string, len(envPy))
 	for name, val := range envPy {
 		v, ok := val.(pyString)
-		s.Assert(ok, "Values of env must be strings, found %v at key %v", val.Type(), name)
+		if !ok {
+			s.Error("Values of env must be strings, found %v at key %v", val.Type(), name)
+		}
 		env[name] = string(v)
 	}
 
@@ -399,8 +441,9 @@ func addMaybeNamedSecret(s *scope, name string, obj pyObject, anon func(string),
 
 // addDependencies adds dependencies to a target, which may or may not be exported.
 func addDependencies(s *scope, name string, obj pyObject, target *core.BuildTarget, exported, internal bool) {
+	bazel := s.state.Config.Bazel.Compatibility
 	addStrings(s, name, obj, func(str string) {
-		if s.state.Config.Bazel.Compatibility && !core.LooksLikeABuildLabel(str) && !strings.HasPrefix(str, "@") {
+		if bazel && !core.LooksLikeABuildLabel(str) && !strings.HasPrefix(str, "@") {
 			// *sigh*... Bazel seems to allow an implicit : on the start of dependencies
 			str = ":" + str
 		}
@@ -412,10 +455,14 @@ func addDependencies(s *scope, name string, obj pyObject, target *core.BuildTarg
 func addStrings(s *scope, name string, obj pyObject, f func(string)) {
 	if obj != nil && obj != None {
 		l, ok := asList(obj)
-		s.Assert(ok, "Argument %s must be a list, not %s", name, obj.Type())
+		if !ok {
+			s.Error("Argument %s must be a list, not %s", name, obj.Type())
+		}
 		for _, li := range l {
 			str, ok := li.(pyString)
-			s.Assert(ok || li == None, "%s must be strings", name)
+			if !ok && li != None {
+				s.Error("%s must be strings", name)
+			}
 			if str != "" && li != None {
 				f(string(str))
 			}
@@ -423,14 +470,37 @@ func addStrings(s *scope, name string, obj pyObject, f func(string)) {
 	}
 }
 
+// listLen returns the length of the given object if it is a list, or zero otherwise.
+func listLen(obj pyObject) int {
+	l, _ := asList(obj)
+	return len(l)
+}
+
+// growStrings returns the given slice with capacity for at least n more items.
+func growStrings(strs []string, n int) []string {
+	if n <= cap(strs)-len(strs) {
+		return strs
+	}
+	ret := make([]string, len(strs), len(strs)+n)
+	copy(ret, strs)
+	return ret
+}
+
 // addProvides adds a set of provides to the target, which is a dict of string -> label
 func addProvides(s *scope, name string, obj pyObject, t *core.BuildTarget) {
 	if obj != nil && obj != None {
 		d, ok := asDict(obj)
-		s.Assert(ok, "Argument %s must be a dict, not %s, %v", name, obj.Type(), obj)
+		if !ok {
+			s.Error("Argument %s must be a dict, not %s, %v", name, obj.Type(), obj)
+		}
+		if t.Provides == nil && len(d) > 1 {
+			t.Provides = make(map[string]core.BuildLabel, len(d))
+		}
 		for k, v := range d {
 			str, ok := v.(pyString)
-			s.Assert(ok, "%s values must be strings", name)
+			if !ok {
+				s.Error("%s values must be strings", name)
+			}
 			t.AddProvide(k, checkLabel(s, core.ParseBuildLabelContext(string(str), s.pkg)))
 		}
 	}
@@ -466,7 +536,9 @@ func parseBuildInput(s *scope, in pyObject, name string, systemAllowed, tool boo
 // parseSource parses an incoming source label as either a file or a build label.
 // Identifies if the file is owned by this package and returns an error if not.
 func parseSource(s *scope, src string, systemAllowed, tool bool) core.BuildInput {
-	if core.LooksLikeABuildLabel(src) {
+	s.Assert(src != "", "Empty source path")
+	// Most sources are plain files, which can be identified from the first character alone.
+	if c := src[0]; (c == '/' || c == ':' || c == '@') && core.LooksLikeABuildLabel(src) {
 		pkg := s.pkg
 		if tool && s.pkg.Subrepo != nil && s.pkg.Subrepo.IsCrossCompile {
 			// Tools should be parsed with the host OS and arch
@@ -480,10 +552,13 @@ func parseSource(s *scope, src string, systemAllowed, tool bool) core.BuildInput
 		}
 		return label
 	}
-	s.Assert(src != "", "Empty source path")
-	s.Assert(!strings.Contains(src, "../"), "%s is an invalid path; build target paths can't contain ../", src)
+	if strings.Contains(src, "../") {
+		s.Error("%s is an invalid path; build target paths can't contain ../", src)
+	}
 	if src[0] == '/' || src[0] == '~' {
-		s.Assert(systemAllowed, "%s is an absolute path; that's not allowed", src)
+		if !systemAllowed {
+			s.Error("%s is an absolute path; that's not allowed", src)
+		}
 		return core.SystemFileLabel{Path: strings.TrimRight(src, "/")}
 	} else if tool {
 		// "go" as a source is interpreted as a file, as a tool it's interpreted as something on the PATH.
@@ -509,22 +584,26 @@ func checkLabel(s *scope, label core.BuildLabel) core.BuildLabel {
 func callbackFunction(s *scope, name string, obj pyObject, requiredArguments int, arguments string) *pyFunc {
 	if obj != nil && obj != None {
 		f := obj.(*pyFunc)
-		s.Assert(len(f.args) == requiredArguments, "%s callbacks must take exactly %d %s (%s takes %d)", name, requiredArguments, arguments, f.name, len(f.args))
+		if len(f.args) != requiredArguments {
+			s.Error("%s callbacks must take exactly %d %s (%s takes %d)", name, requiredArguments, arguments, f.name, len(f.args))
+		}
 		return f
 	}
 	return nil
 }
 
-// A preBuildFunction implements the core.PreBuildFunction interface
+// A preBuildFunction implements the core.PreBuildFunction interface.
+// It only holds on to the config it needs rather than the scope that created it, so that
+// scope (and everything reachable from it) doesn't stay alive for as long as the target does.
 type preBuildFunction struct {
-	f *pyFunc
-	s *scope
+	f      *pyFunc
+	config *pyConfig
 }
 
 func (f *preBuildFunction) Call(target *core.BuildTarget) error {
 	s := f.f.scope.NewPackagedScope(f.f.scope.state.Graph.PackageOrDie(target.Label), 1)
-	s.config = f.s.config
-	s.Set("CONFIG", f.s.config)
+	s.config = f.config
+	s.Set("CONFIG", f.config)
 	s.Callback = true
 	s.Set(f.f.args[0], pyString(target.Label.Name))
 	_, err := s.interpreter.interpretStatements(s, f.f.code)
@@ -535,16 +614,17 @@ func (f *preBuildFunction) String() string {
 	return f.f.String()
 }
 
-// A postBuildFunction implements the core.PostBuildFunction interface
+// A postBuildFunction implements the core.PostBuildFunction interface.
+// As with preBuildFunction, it deliberately doesn't retain the creating scope.
 type postBuildFunction struct {
-	f *pyFunc
-	s *scope
+	f      *pyFunc
+	config *pyConfig
 }
 
 func (f *postBuildFunction) Call(target *core.BuildTarget, output string) error {
 	s := f.f.scope.NewPackagedScope(f.f.scope.state.Graph.PackageOrDie(target.Label), 2)
-	s.config = f.s.config
-	s.Set("CONFIG", f.s.config)
+	s.config = f.config
+	s.Set("CONFIG", f.config)
 	s.Callback = true
 	s.Set(f.f.args[0], pyString(target.Label.Name))
 	s.Set(f.f.args[1], fromStringList(strings.Split(strings.TrimSpace(output), "\n")))
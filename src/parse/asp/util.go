@@ -2,14 +2,14 @@ package asp
 
 import (
 	"reflect"
-	"strings"
+	"sync"
 )
 
 // FindTarget returns the statement in a BUILD file that corresponds to a target
 // of the given name (or nil if one does not exist).
 func FindTarget(statements []*Statement, name string) (target *Statement) {
 	WalkAST(statements, func(stmt *Statement) bool {
-		if arg := FindArgument(stmt, "name"); arg != nil && arg.Value.Val != nil && arg.Value.Val.String != "" && strings.Trim(arg.Value.Val.String, `"`) == name {
+		if arg := FindArgument(stmt, "name"); arg != nil && arg.Value.Val != nil && arg.Value.Val.String != "" && stringLiteral(arg.Value.Val.String) == name {
 			target = stmt
 		}
 		return false // FindArgument is recursive so we never need to visit more deeply.
@@ -17,6 +17,24 @@ func FindTarget(statements []*Statement, name string) (target *Statement) {
 	return
 }
 
+// FindTargets is like FindTarget but finds the statements for several targets in a single pass.
+// Any names that don't correspond to a target won't appear in the returned map.
+func FindTargets(statements []*Statement, names []string) map[string]*Statement {
+	wanted := make(map[string]bool, len(names))
+	for _, name := range names {
+		wanted[name] = true
+	}
+	targets := make(map[string]*Statement, len(names))
+	for _, stmt := range statements {
+		if arg := FindArgument(stmt, "name"); arg != nil && arg.Value.Val != nil && arg.Value.Val.String != "" {
+			if name := stringLiteral(arg.Value.Val.String); wanted[name] {
+				targets[name] = stmt
+			}
+		}
+	}
+	return targets
+}
+
 // NextStatement finds the statement that follows the given one.
 // This is often useful to find the extent of a statement in source code.
 // It will return nil if there is not one following it.
@@ -44,6 +62,19 @@ func GetExtents(statements []*Statement, statement *Statement, max int) (int, in
 // FindArgument finds an argument of any one of the given names, or nil if there isn't one.
 // The statement must be a function call (e.g. as returned by FindTarget).
 func FindArgument(statement *Statement, args ...string) (argument *CallArgument) {
+	if call := plainCall(statement); call != nil {
+		// This is by far the most common case (e.g. a build rule) so look through its
+		// arguments directly instead of reflecting over the whole statement.
+		for i, arg := range call.Arguments {
+			for _, a := range args {
+				if arg.Name == a {
+					argument = &call.Arguments[i]
+					break
+				}
+			}
+		}
+		return
+	}
 	WalkAST([]*Statement{statement}, func(arg *CallArgument) bool {
 		for _, a := range args {
 			if arg.Name == a {
@@ -56,44 +87,102 @@ func FindArgument(statement *Statement, args ...string) (argument *CallArgument)
 	return
 }
 
+// plainCall returns the call made by the given statement if it is nothing more than a single
+// function call, or nil if it's anything else.
+func plainCall(statement *Statement) *Call {
+	if ident := statement.Ident; ident != nil && ident.Unpack == nil && ident.Index == nil {
+		if action := ident.Action; action != nil && action.Property == nil && action.Assign == nil && action.AugAssign == nil {
+			return action.Call
+		}
+	}
+	return nil
+}
+
 // WalkAST is a generic function that walks through the ast recursively,
 // It accepts a function to look for a particular grammar object; it will be called on
 // each instance of that type, and returns a bool - for example
 // WalkAST(ast, func(expr *Expression) bool { ... })
 // If the callback returns true, the node will be further visited; if false it (and
 // all children) will be skipped.
-func WalkAST(ast []*Statement, callback interface{}) {
-	cb := reflect.ValueOf(callback)
-	typ := cb.Type().In(0)
+// Several callbacks for different types can be passed to visit them all in a single walk.
+func WalkAST(ast []*Statement, callbacks ...interface{}) {
+	cbs := make(map[reflect.Type]func(reflect.Value) bool, len(callbacks))
+	for _, callback := range callbacks {
+		cbs[reflect.TypeOf(callback).In(0)] = astCallback(callback)
+	}
 	for _, node := range ast {
-		walkAST(reflect.ValueOf(node), typ, cb)
+		walkAST(reflect.ValueOf(node), cbs)
 	}
 }
 
-func walkAST(v reflect.Value, nodeType reflect.Type, callback reflect.Value) {
-	call := func(v reflect.Value) bool {
-		if v.Type() == nodeType {
-			vs := callback.Call([]reflect.Value{v})
-			return vs[0].Bool()
-		}
-		return true
+// astCallback converts a callback passed to WalkAST into one that takes a reflect.Value.
+// The common types are called directly, which is a lot cheaper than reflect.Value.Call
+// since they get invoked on every node of that type.
+func astCallback(callback interface{}) func(reflect.Value) bool {
+	switch cb := callback.(type) {
+	case func(*Statement) bool:
+		return func(v reflect.Value) bool { return cb(v.Interface().(*Statement)) }
+	case func(*Expression) bool:
+		return func(v reflect.Value) bool { return cb(v.Interface().(*Expression)) }
+	case func(*Call) bool:
+		return func(v reflect.Value) bool { return cb(v.Interface().(*Call)) }
+	case func(*CallArgument) bool:
+		return func(v reflect.Value) bool { return cb(v.Interface().(*CallArgument)) }
+	}
+	cb := reflect.ValueOf(callback)
+	return func(v reflect.Value) bool {
+		return cb.Call([]reflect.Value{v})[0].Bool()
 	}
+}
 
+func walkAST(v reflect.Value, callbacks map[reflect.Type]func(reflect.Value) bool) {
 	if v.Kind() == reflect.Ptr && !v.IsNil() {
-		walkAST(v.Elem(), nodeType, callback)
+		walkAST(v.Elem(), callbacks)
 	} else if v.Kind() == reflect.Slice {
 		for i := 0; i < v.Len(); i++ {
-			walkAST(v.Index(i), nodeType, callback)
+			walkAST(v.Index(i), callbacks)
 		}
 	} else if v.Kind() == reflect.Struct {
-		if call(v.Addr()) {
-			for i := 0; i < v.NumField(); i++ {
-				walkAST(v.Field(i), nodeType, callback)
+		p := v.Addr()
+		if callback, present := callbacks[p.Type()]; !present || callback(p) {
+			for _, i := range walkableFields(v.Type()) {
+				walkAST(v.Field(i), callbacks)
 			}
 		}
 	}
 }
 
+// astFields caches the result of walkableFields for each struct type.
+var astFields sync.Map
+
+// walkableFields returns the indices of the fields of a struct type that can contain further
+// grammar objects. Strings, ints etc can't, so there's no point visiting them at all; nor
+// do we visit unexported fields, which are internal bookkeeping rather than part of the AST.
+func walkableFields(t reflect.Type) []int {
+	if fields, present := astFields.Load(t); present {
+		return fields.([]int)
+	}
+	fields := []int{}
+	for i := 0; i < t.NumField(); i++ {
+		if f := t.Field(i); f.PkgPath == "" && isWalkable(f.Type) {
+			fields = append(fields, i)
+		}
+	}
+	astFields.Store(t, fields)
+	return fields
+}
+
+// isWalkable returns true if the given type can contain a grammar object.
+func isWalkable(t reflect.Type) bool {
+	switch t.Kind() {
+	case reflect.Ptr, reflect.Slice:
+		return isWalkable(t.Elem())
+	case reflect.Struct:
+		return true
+	}
+	return false
+}
+
 // WithinRange returns true if the input position is within the range of the given positions.
 func WithinRange(needle, start, end Position) bool {
 	if needle.Line < start.Line || needle.Line > end.Line {
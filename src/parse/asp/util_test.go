@@ -31,6 +31,18 @@ func TestFindTarget(t *testing.T) {
 	assert.Nil(t, stmt)
 }
 
+func TestFindTargets(t *testing.T) {
+	state := core.NewDefaultBuildState()
+	p := NewParser(state)
+	stmts, err := p.ParseFileOnly("src/parse/asp/test_data/example.build")
+	require.NoError(t, err)
+
+	targets := FindTargets(stmts, []string{"asp", "lexer_test", "wibble"})
+	assert.Equal(t, 2, len(targets))
+	assert.Equal(t, FindTarget(stmts, "asp"), targets["asp"])
+	assert.Equal(t, FindTarget(stmts, "lexer_test"), targets["lexer_test"])
+}
+
 func TestGetExtents(t *testing.T) {
 	state := core.NewDefaultBuildState()
 	p := NewParser(state)
@@ -75,3 +87,48 @@ func TestGetArg(t *testing.T) {
 	assert.Equal(t, 13, vis.Value.Pos.Line)
 	assert.Nil(t, FindArgument(stmt, "wibble"))
 }
+
+func TestWalkASTMultipleCallbacks(t *testing.T) {
+	state := core.NewDefaultBuildState()
+	p := NewParser(state)
+	stmts, err := p.ParseFileOnly("src/parse/asp/test_data/example.build")
+	require.NoError(t, err)
+
+	countStatements := func(stmts []*Statement) (n int) {
+		WalkAST(stmts, func(stmt *Statement) bool {
+			n++
+			return true
+		})
+		return n
+	}
+	countCalls := func(stmts []*Statement) (n int) {
+		WalkAST(stmts, func(call *Call) bool {
+			n++
+			return true
+		})
+		return n
+	}
+	nStmts := 0
+	nCalls := 0
+	WalkAST(stmts, func(stmt *Statement) bool {
+		nStmts++
+		return true
+	}, func(call *Call) bool {
+		nCalls++
+		return true
+	})
+	assert.Equal(t, countStatements(stmts), nStmts)
+	assert.Equal(t, countCalls(stmts), nCalls)
+	assert.NotEqual(t, 0, nCalls)
+}
+
+func TestGetArgNotPlainCall(t *testing.T) {
+	p := NewParser(core.NewDefaultBuildState())
+	stmts, err := p.ParseData([]byte("x = go_library(\n    name = 'x',\n    srcs = ['x.go'],\n)\n"), "BUILD")
+	require.NoError(t, err)
+	require.Equal(t, 1, len(stmts))
+	assert.Nil(t, plainCall(stmts[0]))
+	arg := FindArgument(stmts[0], "srcs")
+	require.NotNil(t, arg)
+	assert.Equal(t, 3, arg.Pos.Line)
+}
@@ -32,7 +32,11 @@ func (h *Handler) diagnostics(d *doc, ast []*asp.Statement) []lsp.Diagnostic {
 		PackageName: path.Dir(d.Filename),
 		Name:        "all",
 	}
-	asp.WalkAST(ast, func(expr *asp.Expression) bool {
+	asp.WalkAST(ast, func(stmt *asp.Statement) bool {
+		// A bare literal statement has no effect (it's usually a docstring), so it can't refer to
+		// anything we'd want to diagnose. Skip it and everything in it.
+		return stmt.Literal == nil
+	}, func(expr *asp.Expression) bool {
 		if expr.Val != nil && expr.Val.String != "" {
 			if s := stringLiteral(expr.Val.String); core.LooksLikeABuildLabel(s) {
 				if l, err := core.TryParseBuildLabel(s, pkgLabel.PackageName, pkgLabel.Subrepo); err == nil {
@@ -507,6 +507,8 @@ go_library(
         "//src/core:nope",
     ],
 )
+
+"//src/core:nope"
 `
 
 func TestDiagnostics(t *testing.T) {
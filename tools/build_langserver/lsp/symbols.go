@@ -33,13 +33,11 @@ func (h *Handler) symbols(params *lsp.DocumentSymbolParams) ([]*lsp.SymbolInform
 		name, kind := stmtToSymbol(stmt)
 		addSym(name, kind, stmt.Pos, stmt.EndPos)
 		return true
-	})
-	asp.WalkAST(stmts, func(expr *asp.Expression) bool {
+	}, func(expr *asp.Expression) bool {
 		name, kind := exprToSymbol(expr)
 		addSym(name, kind, expr.Pos, expr.EndPos)
 		return true
-	})
-	asp.WalkAST(stmts, func(arg *asp.CallArgument) bool {
+	}, func(arg *asp.CallArgument) bool {
 		if arg.Name != "" {
 			addSym(arg.Name, lsp.SKKey, arg.Pos, asp.Position{Line: arg.Pos.Line, Column: arg.Pos.Column + len(arg.Name)})
 		}
@@ -37,6 +37,21 @@ func Create(srcs []string, out string, combine, rename bool) error {
 		}
 	}
 
+	// When combining, we need to know the names of everything in the existing archives to write
+	// the header. Only the headers are read at this point; the contents are copied across later.
+	names := srcs
+	if combine {
+		names = []string{}
+		for _, src := range srcs {
+			if err := forEachMember(src, func(hdr *ar.Header, r io.Reader) error {
+				names = append(names, hdr.Name)
+				return nil
+			}); err != nil {
+				return err
+			}
+		}
+	}
+
 	log.Debug("Writing ar to %s", out)
 	f, err := os.Create(out)
 	if err != nil {
@@ -52,67 +67,84 @@ func Create(srcs []string, out string, combine, rename bool) error {
 			return err
 		}
 	} else {
-		if err := w.WriteGlobalHeaderForLongFiles(allSourceNames(srcs, combine)); err != nil {
+		if err := w.WriteGlobalHeaderForLongFiles(names); err != nil {
 			return err
 		}
 	}
-	for _, src := range srcs {
-		log.Debug("ar source file: %s", src)
-		f, err := os.Open(src)
-		if err != nil {
-			return err
-		}
-		if combine {
-			// Read archive & write its contents in
-			r := ar.NewReader(f)
-			for {
-				hdr, err := r.Next()
-				if err != nil {
-					if err == io.EOF {
-						break
-					}
-					return err
-				} else if hdr.Name == "/" || hdr.Name == "__.SYMDEF SORTED" || hdr.Name == "__.SYMDEF" {
-					log.Debug("skipping symbol table")
-					continue
-				}
-				// Zero things out
-				hdr.ModTime = mtime
-				hdr.Uid = 0
-				hdr.Gid = 0
-				// Fix weird bug about octal numbers (looks like we're prepending 100 multiple times)
-				hdr.Mode &= ^0100000
+	if combine {
+		for _, src := range srcs {
+			if err := forEachMember(src, func(hdr *ar.Header, r io.Reader) error {
 				log.Debug("copying '%s' in from %s, mode %x", hdr.Name, src, hdr.Mode)
 				if err := w.WriteHeader(hdr); err != nil {
 					return err
-				} else if _, err = io.Copy(w, r); err != nil {
-					return err
 				}
-			}
-		} else {
-			// Write in individual file
-			info, err := os.Lstat(src)
-			if err != nil {
-				return err
-			}
-			hdr := &ar.Header{
-				Name:    src,
-				ModTime: mtime,
-				Mode:    int64(info.Mode()),
-				Size:    info.Size(),
-			}
-			log.Debug("creating file %s", hdr.Name)
-			if err := w.WriteHeader(hdr); err != nil {
+				_, err := io.Copy(w, r)
 				return err
-			} else if _, err := io.Copy(w, f); err != nil {
+			}); err != nil {
 				return err
 			}
 		}
+		return nil
+	}
+	for _, src := range srcs {
+		log.Debug("ar source file: %s", src)
+		f, err := os.Open(src)
+		if err != nil {
+			return err
+		}
+		// Write in individual file
+		info, err := os.Lstat(src)
+		if err != nil {
+			return err
+		}
+		hdr := &ar.Header{
+			Name:    src,
+			ModTime: mtime,
+			Mode:    int64(info.Mode()),
+			Size:    info.Size(),
+		}
+		log.Debug("creating file %s", hdr.Name)
+		if err := w.WriteHeader(hdr); err != nil {
+			return err
+		} else if _, err := io.Copy(w, f); err != nil {
+			return err
+		}
 		f.Close()
 	}
 	return nil
 }
 
+// forEachMember calls the given function for each file in an existing ar archive, other than
+// its symbol table. The function can read the file's contents from the given reader.
+func forEachMember(src string, f func(hdr *ar.Header, r io.Reader) error) error {
+	file, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer file.Close()
+	r := ar.NewReader(bufio.NewReader(file))
+	for {
+		hdr, err := r.Next()
+		if err == io.EOF {
+			return nil
+		} else if err != nil {
+			return err
+		} else if hdr.Name == "/" || hdr.Name == "__.SYMDEF SORTED" || hdr.Name == "__.SYMDEF" {
+			log.Debug("skipping symbol table")
+			continue
+		}
+		// Zero things out
+		hdr.ModTime = mtime
+		hdr.Uid = 0
+		hdr.Gid = 0
+		// Fix weird bug about octal numbers (looks like we're prepending 100 multiple times)
+		hdr.Mode &= ^0100000
+		if err := f(hdr, r); err != nil {
+			return err
+		}
+	}
+}
+
 // Find finds all the .a files under the current directory and returns their names.
 func Find() ([]string, error) {
 	ret := []string{}
@@ -123,25 +155,3 @@ func Find() ([]string, error) {
 		return nil
 	})
 }
-
-// allSourceNames returns the name of all source files that we will add to the archive.
-func allSourceNames(srcs []string, combine bool) []string {
-	if !combine {
-		return srcs
-	}
-	ret := []string{}
-	for _, src := range srcs {
-		f, err := os.Open(src)
-		if err == nil {
-			r := ar.NewReader(f)
-			for {
-				hdr, err := r.Next()
-				if err != nil {
-					break
-				}
-				ret = append(ret, hdr.Name)
-			}
-		}
-	}
-	return ret
-}
@@ -33,6 +33,8 @@ type File struct {
 	w        *zip.Writer
 	filename string
 	input    string
+	// wd is the working directory at the time AddFiles was called, so we don't look it up for every file.
+	wd string
 	// Include and Exclude are prefixes of filenames to include or exclude from the zipfile.
 	Include, Exclude []string
 	// RenameDirs is a map of directories to rename, from the old name to the new one.
@@ -212,9 +214,15 @@ func (f *File) AddZipFile(filepath string) error {
 // walk is a callback to walk a file tree and add all files found in it.
 func (f *File) walk(path string, isDir bool, mode os.FileMode) error {
 	if path != f.input && (mode&os.ModeSymlink) != 0 {
-		if resolved, err := filepath.EvalSymlinks(path); err != nil {
+		if !isDir {
+			// We only need to know that the link isn't broken here. Stat follows the whole chain
+			// in a single syscall, whereas EvalSymlinks would lstat every component of the path.
+			if _, err := os.Stat(path); err != nil {
+				return err
+			}
+		} else if resolved, err := filepath.EvalSymlinks(path); err != nil {
 			return err
-		} else if isDir {
+		} else {
 			// TODO(peterebden): Is this case still needed?
 			return fs.WalkMode(resolved, f.walk)
 		}
@@ -228,7 +236,7 @@ func (f *File) walk(path string, isDir bool, mode os.FileMode) error {
 			return nil
 		}
 	}
-	if samePaths(path, f.filename) {
+	if samePathsIn(f.wd, path, f.filename) {
 		return nil
 	} else if !isDir {
 		if !f.matchesSuffix(path, f.ExcludeSuffix) {
@@ -246,6 +254,11 @@ func (f *File) walk(path string, isDir bool, mode os.FileMode) error {
 				log.Debug("Including existing non-zip file %s as %s", path, targetPath)
 				if info, err := os.Lstat(path); err != nil {
 					return err
+				} else if !isBytecode(path) {
+					// Only bytecode needs rewriting; anything else is streamed straight into the zipfile.
+					if err := f.copyFile(targetPath, path, info.Mode()&os.ModePerm); err != nil {
+						return fmt.Errorf("Error reading %s to zipfile: %s", path, err)
+					}
 				} else if b, err := ioutil.ReadFile(path); err != nil {
 					return fmt.Errorf("Error reading %s to zipfile: %s", path, err)
 				} else if err := f.StripBytecodeTimestamp(path, b); err != nil {
@@ -281,10 +294,15 @@ func (f *File) renamePathIfNeeded(name string, isDir bool) string {
 
 // samePaths returns true if two paths are the same (taking relative/absolute paths into account).
 func samePaths(a, b string) bool {
+	wd, _ := os.Getwd()
+	return samePathsIn(wd, a, b)
+}
+
+// samePathsIn is like samePaths but resolves relative paths against the given working directory.
+func samePathsIn(wd, a, b string) bool {
 	if path.IsAbs(a) && path.IsAbs(b) {
 		return a == b
 	}
-	wd, _ := os.Getwd()
 	if !path.IsAbs(a) {
 		a = path.Join(wd, a)
 	}
@@ -297,6 +315,7 @@ func samePaths(a, b string) bool {
 // AddFiles walks the given directory and adds any zip files (determined by suffix) that it finds within.
 func (f *File) AddFiles(in string) error {
 	f.input = in
+	f.wd, _ = os.Getwd()
 	return fs.WalkMode(in, f.walk)
 }
 
@@ -324,8 +343,12 @@ func (f *File) shouldInclude(name string) bool {
 	if len(f.Include) == 0 {
 		return true
 	}
+	// Includes are most often plain prefixes (e.g. the explicit list of libraries the pex writer
+	// wants), so check that first before falling back to the more expensive glob match.
 	for _, incl := range f.Include {
-		if matched, _ := filepath.Match(incl, name); matched || strings.HasPrefix(name, incl) {
+		if strings.HasPrefix(name, incl) {
+			return true
+		} else if matched, _ := filepath.Match(incl, name); matched {
 			return true
 		}
 	}
@@ -450,6 +473,21 @@ func (f *File) addFile(fh *zip.FileHeader, r io.Reader, crc uint32) error {
 
 // WriteFile writes a complete file to the writer.
 func (f *File) WriteFile(filename string, data []byte, mode os.FileMode) error {
+	return f.writeFile(filename, bytes.NewReader(data), mode)
+}
+
+// copyFile writes the contents of a file on disk to the writer without reading it all into memory first.
+func (f *File) copyFile(filename, src string, mode os.FileMode) error {
+	r, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer r.Close()
+	return f.writeFile(filename, r, mode)
+}
+
+// writeFile writes a file to the writer, copying its contents from the given reader.
+func (f *File) writeFile(filename string, r io.Reader, mode os.FileMode) error {
 	filename = path.Join(f.Prefix, filename)
 	fh := zip.FileHeader{
 		Name:   filename,
@@ -468,7 +506,7 @@ func (f *File) WriteFile(filename string, data []byte, mode os.FileMode) error {
 	f.align(&fh)
 	if fw, err := f.w.CreateHeader(&fh); err != nil {
 		return err
-	} else if _, err := fw.Write(data); err != nil {
+	} else if _, err := io.Copy(fw, r); err != nil {
 		return err
 	}
 	f.addExistingFile(filename, filename, 0, 0, 0)
@@ -512,7 +550,7 @@ func (f *File) WritePreamble(preamble []byte) error {
 // StripBytecodeTimestamp strips a timestamp from a .pyc or .pyo file.
 // This is important so our output is deterministic.
 func (f *File) StripBytecodeTimestamp(filename string, contents []byte) error {
-	if strings.HasSuffix(filename, ".pyc") || strings.HasSuffix(filename, ".pyo") {
+	if isBytecode(filename) {
 		if len(contents) < 12 {
 			log.Warning("Invalid bytecode file, will not strip timestamp")
 		} else if f.isPy37(contents) {
@@ -536,6 +574,11 @@ func (f *File) StripBytecodeTimestamp(filename string, contents []byte) error {
 	return nil
 }
 
+// isBytecode returns true if the given filename is a Python bytecode file.
+func isBytecode(filename string) bool {
+	return strings.HasSuffix(filename, ".pyc") || strings.HasSuffix(filename, ".pyo")
+}
+
 // isPy37 determines if the leading magic number in a .pyc corresponds to Python 3.7.
 // This is important to us because the structure changed (see PEP 552) and we have to handle that.
 func (f *File) isPy37(b []byte) bool {
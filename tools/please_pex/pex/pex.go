@@ -150,23 +150,26 @@ func (pw *Writer) Write(out, moduleDir string) error {
 	}
 
 	// Always write pex_main.py, with some templating.
-	b := mustRead("pex_main.py")
-	b = bytes.Replace(b, []byte("__MODULE_DIR__"), []byte(strings.ReplaceAll(moduleDir, ".", "/")), 1)
-	b = bytes.Replace(b, []byte("__ENTRY_POINT__"), []byte(pw.realEntryPoint), 1)
-	b = bytes.Replace(b, []byte("__ZIP_SAFE__"), []byte(pythonBool(pw.zipSafe)), 1)
-	b = bytes.Replace(b, []byte("__PEX_STAMP__"), []byte(pw.pexStamp), 1)
-
+	// Everything goes through a single Replacer so each file is only scanned once.
+	r := strings.NewReplacer(
+		"__MODULE_DIR__", strings.ReplaceAll(moduleDir, ".", "/"),
+		"__ENTRY_POINT__", pw.realEntryPoint,
+		"__ZIP_SAFE__", pythonBool(pw.zipSafe),
+		"__PEX_STAMP__", pw.pexStamp,
+		"__TEST_NAMES__", strings.Join(pw.testSrcs, ","),
+		"__TEST_RUNNER__", pw.customTestRunner,
+	)
+	var b bytes.Buffer
+	r.WriteString(&b, string(mustRead("pex_main.py")))
 	if len(pw.testSrcs) != 0 {
 		// If we're writing a test, we append test_main.py to it.
-		b2 := mustRead("test_main.py")
-		b2 = bytes.Replace(b2, []byte("__TEST_NAMES__"), []byte(strings.Join(pw.testSrcs, ",")), 1)
-		b = append(b, b2...)
+		r.WriteString(&b, string(mustRead("test_main.py")))
 		// It also needs an appropriate test runner.
-		b = append(b, bytes.Replace(mustRead(pw.testRunner), []byte("__TEST_RUNNER__"), []byte(pw.customTestRunner), 1)...)
+		r.WriteString(&b, string(mustRead(pw.testRunner)))
 	}
 	// We always append the final if __name__ == '__main__' bit.
-	b = append(b, mustRead("pex_run.py")...)
-	return f.WriteFile("__main__.py", b, 0644)
+	b.Write(mustRead("pex_run.py"))
+	return f.WriteFile("__main__.py", b.Bytes(), 0644)
 }
 
 // pythonBool returns a Python bool representation of a Go bool.
@@ -109,6 +109,21 @@ class ZipFileWithPermissions(ZipFile):
             os.chmod(targetpath, attr)
         return targetpath
 
+
+_PEX_ZIPFILE = None
+
+
+def pex_zipfile():
+    """Returns a ZipFile for this pex, or False if it isn't a zipfile.
+
+    This is opened once and shared so we only read the zip's central directory a single time.
+    """
+    global _PEX_ZIPFILE
+    if _PEX_ZIPFILE is None:
+        _PEX_ZIPFILE = ZipFileWithPermissions(sys.argv[0]) if is_zipfile(sys.argv[0]) else False
+    return _PEX_ZIPFILE
+
+
 class SoImport(object):
     """So import. Much binary. Such dynamic. Wow."""
 
@@ -120,20 +135,25 @@ class SoImport(object):
             self.suffixes = machinery.EXTENSION_SUFFIXES  # list, as importlib will not be using the file description
 
         self.suffixes_by_length = sorted(self.suffixes, key=lambda x: -len(x))
+        # Tuple form lets us reject the vast majority of names (i.e. .py files) with a single endswith call.
+        self.suffixes_tuple = tuple(self.suffixes_by_length)
         # Identify all the possible modules we could handle.
         self.modules = {}
-        if is_zipfile(sys.argv[0]):
-            zf = ZipFileWithPermissions(sys.argv[0])
+        zf = pex_zipfile()
+        if zf:
+            modules = self.modules
+            bootstrap_len = len('.bootstrap/')
+            module_dir_len = len(MODULE_DIR) + 1
             for name in zf.namelist():
                 path, _ = self.splitext(name)
                 if path:
                     if path.startswith('.bootstrap/'):
-                        path = path[len('.bootstrap/'):]
+                        path = path[bootstrap_len:]
                     importpath = path.replace('/', '.')
-                    self.modules.setdefault(importpath, name)
+                    modules.setdefault(importpath, name)
                     if path.startswith(MODULE_DIR):
-                        self.modules.setdefault(importpath[len(MODULE_DIR)+1:], name)
-            if self.modules:
+                        modules.setdefault(importpath[module_dir_len:], name)
+            if modules:
                 self.zf = zf
 
     def find_module(self, fullname, path=None):
@@ -161,6 +181,8 @@ class SoImport(object):
 
     def splitext(self, path):
         """Similar to os.path.splitext, but splits our longest known suffix preferentially."""
+        if not path.endswith(self.suffixes_tuple):
+            return None, None
         for suffix in self.suffixes_by_length:
             if path.endswith(suffix):
                 return path[:-len(suffix)], suffix
@@ -212,20 +234,20 @@ class ModuleDirImport(object):
                     """
                     self._name = name
                     self._prefix = prefix
+                    self._path = os.path.join(prefix, name)
 
                 def _match_file(self, name, filename):
-                    if re.match(
-                        self.template.format(
-                            path=os.path.join(self._prefix, self._name),
-                            filename=filename,
-                        ),
+                    # Almost no names in the pex will be under our path; reject those with a cheap
+                    # prefix check before formatting and matching the full template.
+                    if name.startswith(self._path) and re.match(
+                        self.template.format(path=self._path, filename=filename),
                         name,
                     ):
                         return name
 
                 def read_text(self, filename):
-                    if is_zipfile(sys.argv[0]):
-                        zf = ZipFileWithPermissions(sys.argv[0])
+                    zf = pex_zipfile()
+                    if zf:
                         for name in zf.namelist():
                             if name and self._match_file(name, filename):
                                 return zf.read(name).decode(encoding="utf-8")
@@ -233,8 +255,8 @@ class ModuleDirImport(object):
                 read_text.__doc__ = Distribution.read_text.__doc__
 
                 def _has_distribution(self):
-                    if is_zipfile(sys.argv[0]):
-                        zf = ZipFileWithPermissions(sys.argv[0])
+                    zf = pex_zipfile()
+                    if zf:
                         for name in zf.namelist():
                             if name and self._match_file(name, ""):
                                 return True
@@ -269,6 +291,35 @@ def pex_paths():
     return pex_path, basepath, uniquedir, no_cache
 
 
+def extract_pex(path):
+    """Extracts the entire contents of the current pex to the given directory.
+
+    On Python 3 this is split across several threads, each of which opens its own handle on
+    the zipfile since ZipFile objects can't safely be shared between them.
+    """
+    with ZipFileWithPermissions(PEX, "r") as zf:
+        if PY_VERSION < (3, 4):
+            zf.extractall(path)
+            return
+        names = zf.namelist()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Create all directories up front; ZipFile.extract can race with itself creating them.
+    for dirname in set(os.path.dirname(name) for name in names):
+        makedirs(os.path.join(path, dirname), exist_ok=True)
+
+    def _extract(chunk):
+        with ZipFileWithPermissions(PEX, "r") as zf:
+            for name in chunk:
+                zf.extract(name, path)
+
+    workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(_extract, [names[i::workers] for i in range(workers)]):
+            pass  # Iterate to propagate any exceptions
+
+
 def explode_zip():
     """Extracts the current pex to a temp directory where we can import everything from.
 
@@ -304,11 +355,14 @@ def explode_zip():
                 import compileall, zipfile
 
                 makedirs(PEX_PATH, exist_ok=True)
-                with ZipFileWithPermissions(PEX, "r") as zf:
-                    zf.extractall(PEX_PATH)
+                extract_pex(PEX_PATH)
 
                 if not no_cache:  # Don't bother optimizing; we're deleting this when we're done.
-                    compileall.compile_dir(PEX_PATH, optimize=2, quiet=1)
+                    if PY_VERSION >= (3, 5):
+                        # workers=0 compiles in parallel using one process per CPU.
+                        compileall.compile_dir(PEX_PATH, optimize=2, quiet=1, workers=0)
+                    else:
+                        compileall.compile_dir(PEX_PATH, optimize=2, quiet=1)
 
                 # Writing nonempty content to the lockfile will signal to subsequent invocations
                 # that the cache has already been prepared.